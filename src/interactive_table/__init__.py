@@ -1,6 +1,13 @@
+from .backends import ArrowDatasetBackend, PandasBackend, QueryBackend
+from .columnar_cache import load_columnar, save_columnar
 from .v_interactive_table import InteractiveTable, Table
 
 __all__ = [
+    "ArrowDatasetBackend",
     "InteractiveTable",
+    "PandasBackend",
+    "QueryBackend",
     "Table",
+    "load_columnar",
+    "save_columnar",
 ]
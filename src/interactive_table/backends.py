@@ -0,0 +1,321 @@
+from typing import Protocol
+
+import numpy as np
+import pandas as pd
+
+from .column_statistics import ColumnStatistics
+from .schema import TableSchema
+from .sort_cache import SortCache
+
+
+class QueryBackend(Protocol):
+    """Operations to query filtered and sorted pages of tabular data.
+
+    Filters are given as ``(column, filter_type, value)`` tuples with the
+    filter types of lazyfilter (``"value_range"``, ``"quantile_range"`` and
+    ``"selected_values"``), sort keys as columns and sort directions, which
+    default to ascending. The index is referred to by ``pd.Index``.
+
+    Tables of a dataframe filter, sort and edit it in memory with a
+    ``PandasBackend`` and its caches. Tables of a backend, e.g., for a dataset
+    on disk, are read-only and request one page of the unfiltered rows at a
+    time.
+    """
+
+    schema: TableSchema
+
+    def count(self, filters=()) -> int: ...
+
+    def page(
+        self,
+        *,
+        filters=(),
+        sort_by=(),
+        descending=(),
+        offset=0,
+        limit=None,
+        columns=None,
+    ) -> pd.DataFrame: ...
+
+    def column_stats(self, column) -> tuple: ...
+
+    def uniques(self, column) -> list: ...
+
+
+class PandasBackend:
+    """Query backend for a dataframe in memory.
+
+    Sort orders, dictionary encodings and column statistics are computed
+    once and shared by all queries.
+    """
+
+    def __init__(self, dataframe):
+        self.dataframe = dataframe
+        self.schema = TableSchema(dataframe)
+        self.sort_cache = SortCache(dataframe)
+        self.statistics = ColumnStatistics(dataframe, self.sort_cache)
+
+    def mask(self, column, filter_type, value):
+        """Boolean mask of the rows that pass a single filter."""
+        if filter_type == "selected_values":
+            # look up the selected unique values once, then gather by code
+            codes, uniques = self.sort_cache.encoding(column)
+            selected = np.zeros(len(uniques) + 1, dtype=bool)
+            selected[:-1] = pd.Index(uniques).isin(list(value))
+            return selected[codes]
+        if filter_type == "value_range":
+            lower, upper = value
+        elif filter_type == "quantile_range":
+            lower, upper = self.sort_cache.quantiles(column, value)
+        else:
+            raise ValueError(f"Unsupported filter type {filter_type}")
+        mask = np.zeros(len(self.dataframe), dtype=bool)
+        mask[self.sort_cache.range_positions(column, lower, upper)] = True
+        return mask
+
+    def _filter_mask(self, filters):
+        mask = np.ones(len(self.dataframe), dtype=bool)
+        for column, filter_type, value in filters:
+            mask &= self.mask(column, filter_type, value)
+        return mask
+
+    def count(self, filters=()):
+        return int(np.count_nonzero(self._filter_mask(filters)))
+
+    def page(
+        self,
+        *,
+        filters=(),
+        sort_by=(),
+        descending=(),
+        offset=0,
+        limit=None,
+        columns=None,
+    ):
+        positions = np.flatnonzero(self._filter_mask(filters))
+        positions = self.sort_cache.sort(
+            positions, list(sort_by), _sort_directions(sort_by, descending)
+        )
+        stop = None if limit is None else offset + limit
+        frame = self.dataframe.iloc[positions[offset:stop]]
+        return frame if columns is None else frame[list(columns)]
+
+    def column_stats(self, column):
+        return self.statistics.bounds(column)
+
+    def uniques(self, column):
+        return self.statistics.unique_values(column)
+
+
+def _sort_directions(sort_by, descending):
+    descending = list(descending)
+    return descending + [False] * (len(sort_by) - len(descending))
+
+
+def _to_pandas(table):
+    frame = table.to_pandas()
+    # strings are held in object columns, as in the dataframes of the table
+    return frame.astype(
+        {
+            column_name: object
+            for column_name, dtype in frame.dtypes.items()
+            if pd.api.types.is_string_dtype(dtype)
+            and not isinstance(dtype, pd.CategoricalDtype)
+        }
+    )
+
+
+def _length(offset, start, stop):
+    # rows of a batch starting at ``start`` that are part of the page
+    return None if stop is None else stop - max(offset, start)
+
+
+class ArrowDatasetBackend:
+    """Query backend for a dataset on disk, e.g., a directory of Parquet files.
+
+    Filters are passed to the dataset scanner, which skips row groups whose
+    statistics exclude them, and only the requested columns are read. Pages
+    without sorting stop reading once they are complete, and pages of an
+    unfiltered Parquet dataset read only the row groups they overlap. Sorted pages
+    read the sort and requested columns of all rows that pass the filters.
+    The index of a page counts the rows of the query result.
+
+    Requires pyarrow.
+    """
+
+    def __init__(self, source, *, format="parquet", batch_size=65536):
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            import pyarrow.dataset as ds
+        except ImportError as e:
+            raise ImportError("ArrowDatasetBackend requires pyarrow.") from e
+        self._pa = pa
+        self._pc = pc
+        self.dataset = ds.dataset(source, format=format)
+        # only Parquet files have row groups with statistics
+        self._row_groups = isinstance(
+            getattr(self.dataset, "format", None), ds.ParquetFileFormat
+        )
+        self.batch_size = batch_size
+        self.schema = TableSchema(_to_pandas(self.dataset.schema.empty_table()))
+        self._column_stats = {}
+        self._uniques = {}
+        self._quantiles = {}
+
+    def _quantile_bounds(self, column, q):
+        key = (column, tuple(q))
+        if key not in self._quantiles:
+            # the dataset does not change, so its quantiles are read once
+            values = self.dataset.to_table(columns=[column])[column]
+            self._quantiles[key] = self._pc.quantile(values, q=list(q)).to_pylist()
+        return self._quantiles[key]
+
+    def _expression(self, filters):
+        pc = self._pc
+        expression = None
+        for column, filter_type, value in filters:
+            if column is pd.Index:
+                raise ValueError("Datasets cannot be filtered by index.")
+            field = pc.field(column)
+            if filter_type == "selected_values":
+                condition = field.isin(list(value))
+            else:
+                if filter_type == "value_range":
+                    lower, upper = value
+                elif filter_type == "quantile_range":
+                    lower, upper = self._quantile_bounds(column, value)
+                else:
+                    raise ValueError(f"Unsupported filter type {filter_type}")
+                condition = (field >= lower) & (field <= upper)
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def count(self, filters=()):
+        return self.dataset.count_rows(filter=self._expression(filters))
+
+    def _row_group_page(self, offset, stop, columns):
+        tables = []
+        start = 0
+        for fragment in self.dataset.get_fragments():
+            for row_group in fragment.split_by_row_group():
+                num_rows = row_group.row_groups[0].num_rows
+                if start + num_rows > offset and (stop is None or start < stop):
+                    table = row_group.to_table(columns=columns)
+                    tables.append(
+                        table.slice(
+                            max(offset - start, 0), _length(offset, start, stop)
+                        )
+                    )
+                start += num_rows
+                if stop is not None and start >= stop:
+                    return tables
+        return tables
+
+    def _scanned_page(self, expression, offset, stop, columns):
+        tables = []
+        start = 0
+        scanner = self.dataset.scanner(
+            columns=columns, filter=expression, batch_size=self.batch_size
+        )
+        for batch in scanner.to_batches():
+            if start + batch.num_rows > offset:
+                rows = batch.slice(max(offset - start, 0), _length(offset, start, stop))
+                tables.append(self._pa.Table.from_batches([rows]))
+            start += batch.num_rows
+            if stop is not None and start >= stop:
+                break
+        return tables
+
+    def _sorted_page(self, expression, sort_by, descending, stop, columns):
+        pa, pc = self._pa, self._pc
+        sort_keys = [
+            (column, "descending" if desc else "ascending")
+            for column, desc in zip(sort_by, _sort_directions(sort_by, descending))
+        ]
+        read_columns = list(dict.fromkeys(list(columns) + list(sort_by)))
+        best = None
+        scanner = self.dataset.scanner(
+            columns=read_columns, filter=expression, batch_size=self.batch_size
+        )
+        if stop is None:
+            # all rows are part of the page, so they are sorted once
+            table = scanner.to_table()
+            order = pc.sort_indices(table, sort_keys=sort_keys)
+            return [table.take(order).select(columns)]
+        # keep only the rows that can still be part of the page
+        for batch in scanner.to_batches():
+            table = pa.Table.from_batches([batch])
+            if best is not None:
+                table = pa.concat_tables([best, table])
+            order = pc.sort_indices(table, sort_keys=sort_keys)
+            best = table.take(order[:stop])
+        return [] if best is None else [best.select(columns)]
+
+    def page(
+        self,
+        *,
+        filters=(),
+        sort_by=(),
+        descending=(),
+        offset=0,
+        limit=None,
+        columns=None,
+    ):
+        if columns is None:
+            columns = self.dataset.schema.names
+        columns = list(columns)
+        if pd.Index in sort_by:
+            raise ValueError("Datasets cannot be sorted by index.")
+        stop = None if limit is None else offset + limit
+        expression = self._expression(filters)
+        if len(sort_by) > 0:
+            tables = self._sorted_page(expression, sort_by, descending, stop, columns)
+            tables = [table.slice(offset) for table in tables]
+        elif expression is None and self._row_groups:
+            tables = self._row_group_page(offset, stop, columns)
+        else:
+            tables = self._scanned_page(expression, offset, stop, columns)
+        if len(tables) == 0:
+            table = self.dataset.schema.empty_table().select(columns)
+        else:
+            table = self._pa.concat_tables(tables)
+        frame = _to_pandas(table)
+        frame.index = pd.RangeIndex(offset, offset + len(frame))
+        return frame
+
+    def column_stats(self, column):
+        if column not in self._column_stats:
+            self._column_stats[column] = self._row_group_bounds(column)
+        return self._column_stats[column]
+
+    def _read_bounds(self, column):
+        bounds = self._pc.min_max(self.dataset.to_table(columns=[column])[column])
+        return bounds["min"].as_py(), bounds["max"].as_py()
+
+    def _row_group_bounds(self, column):
+        if not self._row_groups:
+            return self._read_bounds(column)
+        lower, upper = None, None
+        for fragment in self.dataset.get_fragments():
+            fragment.ensure_complete_metadata()
+            for row_group in fragment.row_groups:
+                statistics = (row_group.statistics or {}).get(column)
+                if statistics is None or "min" not in statistics:
+                    # without statistics, the column is read once
+                    return self._read_bounds(column)
+                if lower is None or statistics["min"] < lower:
+                    lower = statistics["min"]
+                if upper is None or statistics["max"] > upper:
+                    upper = statistics["max"]
+        return lower, upper
+
+    def uniques(self, column):
+        if column not in self._uniques:
+            uniques = set()
+            scanner = self.dataset.scanner(columns=[column], batch_size=self.batch_size)
+            for batch in scanner.to_batches():
+                uniques.update(self._pc.unique(batch.column(0)).to_pylist())
+            uniques.discard(None)
+            self._uniques[column] = sorted(uniques)
+        return self._uniques[column]
@@ -0,0 +1,95 @@
+from bisect import bisect_left, insort
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnStatistics:
+    """Unique values and bounds of dataframe columns, maintained under edits.
+
+    Columns are referred to by name, the dataframe index by ``pd.Index``.
+    Statistics are computed on first use and ignore missing values. Replacing
+    a single value updates them without rescanning the column, unless an
+    extreme value is removed, in which case the bounds are recomputed when
+    they are requested next.
+    """
+
+    def __init__(self, dataframe, sort_cache):
+        self.dataframe = dataframe
+        self.sort_cache = sort_cache
+        self._counts = {}
+        self._unique_values = {}
+        self._bounds = {}
+        self._versions = {}
+        self._generation = 0
+
+    def _values(self, column):
+        if column is pd.Index:
+            return self.dataframe.index.to_series()
+        return self.dataframe[column]
+
+    def version(self, column):
+        """Changes whenever the statistics of a column may have changed."""
+        return self._generation, self._versions.get(column, 0)
+
+    def unique_values(self, column):
+        """Sorted unique values of a column."""
+        if column not in self._counts:
+            # count the codes of the dictionary encoding shared with sorting
+            codes, uniques = self.sort_cache.encoding(column)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            used = counts > 0
+            self._counts[column] = dict(
+                zip(uniques[used].tolist(), counts[used].tolist())
+            )
+            self._unique_values[column] = sorted(self._counts[column])
+        return self._unique_values[column]
+
+    def bounds(self, column):
+        """Minimum and maximum of a column."""
+        if column not in self._bounds:
+            values = self._values(column)
+            self._bounds[column] = (values.min(), values.max())
+        return self._bounds[column]
+
+    def replace(self, column, old, new):
+        """Account for one value of a column being replaced."""
+        self._versions[column] = self._versions.get(column, 0) + 1
+        if column in self._counts:
+            counts = self._counts[column]
+            unique_values = self._unique_values[column]
+            if not pd.isna(old):
+                counts[old] -= 1
+                if counts[old] == 0:
+                    del counts[old]
+                    del unique_values[bisect_left(unique_values, old)]
+            if not pd.isna(new):
+                if new not in counts:
+                    counts[new] = 0
+                    insort(unique_values, new)
+                counts[new] += 1
+        if column in self._bounds:
+            lower, upper = self._bounds[column]
+            if pd.isna(old):
+                removes_bound = pd.isna(lower)
+            else:
+                # a removed extreme is only known to be replaced by a new one
+                removes_bound = (old == lower and not new <= old) or (
+                    old == upper and not new >= old
+                )
+            if removes_bound:
+                del self._bounds[column]
+            elif not pd.isna(new):
+                self._bounds[column] = (min(lower, new), max(upper, new))
+
+    def invalidate(self, column=None):
+        if column is None:
+            self._counts.clear()
+            self._unique_values.clear()
+            self._bounds.clear()
+            self._generation += 1
+            return
+        self._counts.pop(column, None)
+        self._unique_values.pop(column, None)
+        self._bounds.pop(column, None)
+        self._versions[column] = self._versions.get(column, 0) + 1
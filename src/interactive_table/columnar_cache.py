@@ -0,0 +1,171 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+_METADATA = "columns.json"
+# unique values and categories are kept in the metadata file
+_JSON_TYPES = (str, int, float, bool)
+
+
+def _check_json_values(values, name):
+    if not all(type(value) in _JSON_TYPES for value in values):
+        raise ValueError(f"{name!r} holds values that cannot be saved as JSON.")
+
+
+def _restores_by_name(dtype):
+    # string dtypes are rebuilt from the dictionary-encoded values
+    return (
+        isinstance(dtype, pd.StringDtype)
+        and pd.api.types.pandas_dtype(str(dtype)) == dtype
+    )
+
+
+def _encode_values(values, name):
+    """Describe and encode values, raising before anything is written.
+
+    Values whose dtype would change when they are loaded, e.g., nullable
+    integers or timezone-aware datetimes, are not supported.
+    """
+    dtype = values.dtype
+    description = {}
+    if isinstance(dtype, pd.CategoricalDtype):
+        categorical = values.array
+        _check_json_values(categorical.categories.tolist(), name)
+        description["kind"] = "categorical"
+        description["categories"] = categorical.categories.tolist()
+        description["ordered"] = bool(categorical.ordered)
+        values = categorical.codes
+    elif isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        description["kind"] = "numpy"
+        values = np.asarray(values)
+    elif dtype == object or _restores_by_name(dtype):
+        # other values are dictionary encoded, missing values have code -1
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        uniques = uniques.tolist()
+        _check_json_values(uniques, name)
+        description["kind"] = "object"
+        description["uniques"] = uniques
+        if dtype != object:
+            description["dtype"] = str(dtype)
+        values = codes
+    else:
+        raise ValueError(f"{name!r} has the unsupported dtype {dtype}.")
+    return description, np.ascontiguousarray(values)
+
+
+def _load_values(description, directory, mmap_mode, categorical_strings):
+    """Load values and the dtype to keep them in."""
+    values = np.load(directory / description["file"], mmap_mode=mmap_mode)
+    if description["kind"] == "numpy":
+        return values, None
+    if description["kind"] == "categorical" or categorical_strings:
+        categories = description.get("categories", description.get("uniques"))
+        dtype = pd.CategoricalDtype(categories, ordered=description.get("ordered"))
+        # from_codes only keeps the memory-mapped codes without validation
+        return pd.Categorical.from_codes(values, dtype=dtype, validate=False), None
+    uniques = np.empty(len(description["uniques"]) + 1, dtype=object)
+    uniques[:-1] = description["uniques"]
+    uniques[-1] = None
+    # keep strings in object columns instead of inferring a string dtype
+    return uniques[values], description.get("dtype", object)
+
+
+def save_columnar(dataframe, path):
+    """Save a dataframe as one ``.npy`` file per column.
+
+    Numeric and boolean columns are stored as they are, categorical columns
+    as their codes and object and string columns as codes into a dictionary
+    of unique values, which is kept in a metadata file.
+
+    Parameters
+    ----------
+    dataframe : pd.DataFrame
+        The dataframe to save.
+    path : str or Path
+        The directory to save the columns to, created if necessary.
+
+    Raises
+    ------
+    ValueError
+        If a column would not be loaded with the same dtype and values, e.g.,
+        nullable integers or timezone-aware datetimes. Nothing is written
+        then.
+    """
+    index = dataframe.index
+    arrays = {}
+    if isinstance(index, pd.RangeIndex):
+        index_description = {
+            "kind": "range",
+            "start": index.start,
+            "stop": index.stop,
+            "step": index.step,
+        }
+    else:
+        index_description, arrays["index.npy"] = _encode_values(index, "index")
+        index_description["file"] = "index.npy"
+    index_description["name"] = index.name
+    columns = []
+    for position, column_name in enumerate(dataframe.columns):
+        description, arrays[f"{position}.npy"] = _encode_values(
+            dataframe[column_name], column_name
+        )
+        columns.append({"name": column_name, "file": f"{position}.npy"} | description)
+    # all columns are encoded before any file is written
+    metadata = json.dumps({"index": index_description, "columns": columns})
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    for file_name, values in arrays.items():
+        np.save(directory / file_name, values)
+    (directory / _METADATA).write_text(metadata)
+
+
+def load_columnar(path, *, mmap_mode="c", categorical_strings=False):
+    """Load a dataframe saved with ``save_columnar`` as memory-mapped columns.
+
+    The columns are zero-copy views of the memory-mapped files, so several
+    processes that load the same files share their pages. With the default
+    copy-on-write mode, edits only copy the pages they change and are never
+    written back to the files.
+
+    Parameters
+    ----------
+    path : str or Path
+        The directory the columns were saved to.
+    mmap_mode : str, optional
+        The memory-map mode passed to ``np.load``.
+    categorical_strings : bool, optional
+        Whether to load dictionary-encoded columns, e.g., strings, as
+        categorical columns. These are zero-copy as well, while object
+        columns are rebuilt in memory from their codes.
+
+    Returns
+    -------
+    pd.DataFrame
+        The loaded dataframe.
+    """
+    directory = Path(path)
+    metadata = json.loads((directory / _METADATA).read_text())
+    index_description = metadata["index"]
+    if index_description["kind"] == "range":
+        index = pd.RangeIndex(
+            index_description["start"],
+            index_description["stop"],
+            index_description["step"],
+            name=index_description["name"],
+        )
+    else:
+        values, dtype = _load_values(index_description, directory, mmap_mode, False)
+        index = pd.Index(
+            values, dtype=dtype, name=index_description["name"], copy=False
+        )
+    columns = {}
+    for description in metadata["columns"]:
+        values, dtype = _load_values(
+            description, directory, mmap_mode, categorical_strings
+        )
+        columns[description["name"]] = pd.Series(
+            values, index=index, dtype=dtype, copy=False
+        )
+    return pd.DataFrame(columns, index=index, copy=False)
@@ -0,0 +1,109 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+Edit = namedtuple("Edit", ["column", "positions", "old_values", "new_values"])
+
+
+class EditLog:
+    """History of edits to the columns of a dataframe.
+
+    Every edit sets the values of one column at some row positions and is
+    stored as arrays of these positions and of the old and new values, so
+    that the dataframe itself never needs to be copied. Edits can be undone
+    and redone until they are committed.
+    """
+
+    def __init__(self, dataframe):
+        self.dataframe = dataframe
+        self._edits = []
+        self._undone = []
+
+    @property
+    def can_undo(self):
+        return len(self._edits) > 0
+
+    @property
+    def can_redo(self):
+        return len(self._undone) > 0
+
+    def record(self, column, positions, old_values, new_values):
+        self._edits.append(
+            Edit(
+                column,
+                np.asarray(positions, dtype=np.intp),
+                np.asarray(old_values),
+                np.asarray(new_values),
+            )
+        )
+        self._undone.clear()
+
+    def undo(self):
+        """Remove the latest edit, the caller restores its old values."""
+        if not self.can_undo:
+            return None
+        edit = self._edits.pop()
+        self._undone.append(edit)
+        return edit
+
+    def redo(self):
+        """Restore the latest undone edit, the caller writes its new values."""
+        if not self.can_redo:
+            return None
+        edit = self._undone.pop()
+        self._edits.append(edit)
+        return edit
+
+    def commit(self):
+        """Accept all edits, which cannot be undone afterwards."""
+        self._edits.clear()
+        self._undone.clear()
+
+    def discard(self):
+        """Remove all edits, the caller restores their old values in order."""
+        edits = self._edits[::-1]
+        self.commit()
+        return edits
+
+    def diff(self):
+        """The net changes of all edits, one row per changed cell.
+
+        Returns
+        -------
+        pd.DataFrame
+            The index label, column, old and new value of every cell whose
+            value differs from its value before the first edit.
+        """
+        columns = ["index", "column", "old", "new"]
+        if not self.can_undo:
+            return pd.DataFrame(columns=columns)
+        changes = pd.DataFrame(
+            {
+                "position": np.concatenate([edit.positions for edit in self._edits]),
+                "column": np.concatenate(
+                    [
+                        np.repeat(edit.column, len(edit.positions))
+                        for edit in self._edits
+                    ]
+                ),
+                "old": np.concatenate(
+                    [edit.old_values.astype(object) for edit in self._edits]
+                ),
+                "new": np.concatenate(
+                    [edit.new_values.astype(object) for edit in self._edits]
+                ),
+            }
+        )
+        # the old value before the first edit and the new value of the last one
+        cell = ["position", "column"]
+        changes = changes.drop_duplicates(cell, keep="first")[cell + ["old"]].merge(
+            changes.drop_duplicates(cell, keep="last")[cell + ["new"]], on=cell
+        )
+        changed = ~(
+            (changes["old"] == changes["new"])
+            | (changes["old"].isna() & changes["new"].isna())
+        )
+        changes = changes[changed]
+        changes.insert(0, "index", self.dataframe.index[changes["position"]])
+        return changes[columns].reset_index(drop=True)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+
+def compute_patch(old_index, new_index, dirty=None):
+    """Compute the operations that turn the rows of one index into another.
+
+    Parameters
+    ----------
+    old_index : pd.Index
+        Index of the rows that are currently displayed.
+    new_index : pd.Index
+        Index of the rows that should be displayed.
+    dirty : collection, optional
+        Index labels of rows with modified values.
+
+    Returns
+    -------
+    tuple of np.ndarray or None
+        Positions of removed rows (in the old index), positions of inserted
+        rows and positions of updated rows (both in the new index). None if
+        the rows that are kept changed their relative order.
+    """
+    old_index = pd.Index(old_index)
+    new_index = pd.Index(new_index)
+    kept = old_index.isin(new_index)
+    added = ~new_index.isin(old_index)
+    if not old_index[kept].equals(new_index[~added]):
+        return None
+    removed = np.flatnonzero(~kept)
+    inserted = np.flatnonzero(added)
+    if dirty is None or len(dirty) == 0:
+        updated = np.array([], dtype=int)
+    else:
+        updated = np.flatnonzero(~added & new_index.isin(list(dirty)))
+    return removed, inserted, updated
+
+
+def apply_patch(items, removed, inserted, updated):
+    """Apply a patch in place to a list of items.
+
+    Parameters
+    ----------
+    items : list
+        The items to patch.
+    removed : sequence of int
+        Positions of removed items.
+    inserted : sequence of tuple
+        Positions and values of inserted items.
+    updated : sequence of tuple
+        Positions and values of updated items.
+    """
+    removed = set(removed)
+    kept = (item for position, item in enumerate(items) if position not in removed)
+    inserted = dict(inserted)
+    num_items = len(items) - len(removed) + len(inserted)
+    patched = [
+        inserted[position] if position in inserted else next(kept)
+        for position in range(num_items)
+    ]
+    for position, item in updated:
+        patched[position] = item
+    items[:] = patched
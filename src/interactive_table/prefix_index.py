@@ -0,0 +1,57 @@
+import numpy as np
+
+
+class PrefixIndex:
+    """Case-insensitive prefix search over a fixed set of values.
+
+    The string representations of the values are kept in a sorted array, so
+    that all matches of a prefix form a contiguous range found by binary
+    search.
+    """
+
+    def __init__(self, values):
+        values = np.asarray(list(values), dtype=object)
+        # variable width strings, a fixed width would pad every key to the
+        # longest one
+        keys = np.array(
+            [str(value).casefold() for value in values],
+            dtype=np.dtypes.StringDType(),
+        )
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._values = values[order]
+
+    def __len__(self):
+        return len(self._values)
+
+    def search(self, prefix, limit):
+        """The first ``limit`` values starting with a prefix, in sorted order."""
+        prefix = "" if prefix is None else str(prefix).casefold()
+        start = np.searchsorted(self._keys, prefix, side="left")
+        stop = np.searchsorted(self._keys, prefix + "\U0010ffff", side="left")
+        return self._values[start : min(stop, start + limit)].tolist()
+
+
+class SearchableValues:
+    """Values shown up to a limit, the others are found by prefix search.
+
+    The prefix index is built on the first search, as most value sets are
+    replaced before anyone searches them.
+    """
+
+    def __init__(self, values, limit):
+        self.values = list(values)
+        self.limit = limit
+        self._index = None
+
+    @property
+    def is_capped(self):
+        return len(self.values) > self.limit
+
+    def search(self, prefix):
+        """The first ``limit`` values starting with a prefix."""
+        if not prefix:
+            return self.values[: self.limit]
+        if self._index is None:
+            self._index = PrefixIndex(self.values)
+        return self._index.search(prefix, self.limit)
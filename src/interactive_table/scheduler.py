@@ -0,0 +1,104 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class UpdateScheduler:
+    """Coalesce bursts of keyed updates and run only the latest state.
+
+    Updates scheduled within ``delay`` seconds after the first pending update
+    are merged, later values replacing earlier ones with the same key, and
+    passed to the callback at once. Without a delay or a running event loop,
+    updates are passed on immediately.
+    """
+
+    def __init__(self, callback, *, delay=0.0):
+        self.callback = callback
+        self.delay = delay
+        self._pending = {}
+        self._handle = None
+
+    def schedule(self, updates):
+        self._pending.update(updates)
+        loop = _running_loop()
+        if self.delay <= 0 or loop is None:
+            self.flush()
+            return
+        if self._handle is None:
+            self._handle = loop.call_later(self.delay, self.flush)
+
+    def flush(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if len(self._pending) == 0:
+            return
+        updates = self._pending
+        self._pending = {}
+        self.callback(updates)
+
+
+class BackgroundRunner:
+    """Run work in a worker thread and deliver only the newest result per kind.
+
+    Every submission starts a new generation of its kind of work, e.g.,
+    evaluating filters or preparing rows, so that different kinds do not
+    supersede each other. Work of an older generation is skipped if it has
+    not started yet and its result is discarded otherwise. ``on_busy`` is
+    called with True when work is submitted and with False once the newest
+    results of all kinds were delivered. Without a running event loop, work
+    runs synchronously.
+    """
+
+    def __init__(self, *, on_busy=None):
+        self.on_busy = on_busy
+        self._generations = {}
+        self._running = set()
+        self._executor = None
+
+    def _set_busy(self, busy):
+        if self.on_busy is not None:
+            self.on_busy(busy)
+
+    def is_running(self, kind=None):
+        """Whether the newest result of a kind of work is still pending."""
+        return kind in self._running
+
+    def submit(self, work, done, *, kind=None):
+        generation = self._generations.get(kind, 0) + 1
+        self._generations[kind] = generation
+        loop = _running_loop()
+        if loop is None:
+            done(work())
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+
+        def run():
+            if generation != self._generations[kind]:
+                return None
+            return work()
+
+        self._running.add(kind)
+        self._set_busy(True)
+        future = loop.run_in_executor(self._executor, run)
+        future.add_done_callback(
+            lambda future: self._finish(kind, generation, future, done)
+        )
+
+    def _finish(self, kind, generation, future, done):
+        if generation != self._generations[kind] or future.cancelled():
+            return
+        try:
+            done(future.result())
+        finally:
+            if generation == self._generations[kind]:
+                self._running.discard(kind)
+                if len(self._running) == 0:
+                    self._set_busy(False)
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+
+class ColumnSchema:
+    __slots__ = ("dtype", "kind", "name")
+
+    def __init__(self, name, dtype):
+        kinds = [
+            kind
+            for kind, matches in (
+                ("bool", dtype == "bool"),
+                ("int", "int" in str(dtype)),
+                ("float", "float" in str(dtype)),
+                ("categorical", isinstance(dtype, pd.CategoricalDtype)),
+                ("string", dtype == "O"),
+            )
+            if matches
+        ]
+        if len(kinds) != 1:
+            raise ValueError(f"{name} has unsupported dtype {dtype}")
+        self.name = name
+        self.dtype = dtype
+        self.kind = kinds[0]
+
+    @property
+    def categories(self):
+        if self.kind != "categorical":
+            return None
+        return self.dtype.categories
+
+    def cast(self, values):
+        """Convert new values of the column to its dtype.
+
+        Raises a ValueError if the values do not fit the column without
+        changing its dtype. Values of categorical columns are returned as
+        they are, the caller is responsible for adding new categories.
+        """
+        values = pd.Series(values)
+        if self.kind == "categorical":
+            return values
+        if self.kind == "string":
+            valid = pd.api.types.infer_dtype(values, skipna=True) in (
+                "string",
+                "empty",
+            )
+        elif self.kind == "bool":
+            valid = pd.api.types.is_bool_dtype(values.dtype)
+        elif self.kind == "int":
+            bounds = np.iinfo(self.dtype)
+            valid = (
+                pd.api.types.is_integer_dtype(values.dtype)
+                and not pd.api.types.is_bool_dtype(values.dtype)
+                and (
+                    len(values) == 0
+                    or (values.min() >= bounds.min and values.max() <= bounds.max)
+                )
+            )
+        else:
+            valid = pd.api.types.is_numeric_dtype(
+                values.dtype
+            ) and not pd.api.types.is_bool_dtype(values.dtype)
+        if not valid:
+            raise ValueError(f"{self.name} cannot hold values of dtype {values.dtype}")
+        return values.astype(self.dtype)
+
+    def parse(self, value):
+        """Convert a value entered in the browser to the dtype of the column.
+
+        Raises a ValueError if the value does not fit the column. Values of
+        categorical columns have to be existing categories.
+        """
+        text = str(value)
+        try:
+            if self.kind == "bool":
+                value = text.lower() == "true"
+            elif self.kind == "int":
+                value = int(text)
+            elif self.kind == "float":
+                value = float(text)
+            elif self.kind == "string":
+                value = text
+            else:
+                value = ColumnSchema(self.name, self.categories.dtype).parse(text)
+        except ValueError as e:
+            raise ValueError(f"{self.name} cannot hold {text!r}") from e
+        if self.kind == "categorical":
+            if value not in self.categories:
+                raise ValueError(f"{value!r} is not a category of {self.name}")
+            return value
+        return self.cast([value]).iloc[0]
+
+    def to_json(self):
+        if self.kind == "int":
+            bounds = np.iinfo(self.dtype)
+            return {"kind": self.kind, "min": int(bounds.min), "max": int(bounds.max)}
+        return {"kind": self.kind}
+
+
+class TableSchema:
+    """Column types of a dataframe, inspected once per column.
+
+    The schema of a column is created when it is first requested, so
+    columns with unsupported dtypes only raise if they are used. It only
+    needs to be refreshed when the dtype of the column changes, e.g., when
+    a categorical column gains a new category.
+    """
+
+    __slots__ = ("_columns", "dataframe")
+
+    def __init__(self, dataframe):
+        self.dataframe = dataframe
+        self._columns = {}
+
+    def __getitem__(self, column_name):
+        if column_name not in self._columns:
+            self._columns[column_name] = ColumnSchema(
+                column_name, self.dataframe[column_name].dtype
+            )
+        return self._columns[column_name]
+
+    def __contains__(self, column_name):
+        return column_name in self.dataframe.columns
+
+    def invalidate(self, column_name):
+        self._columns.pop(column_name, None)
+
+    def to_json(self, columns):
+        return {column_name: self[column_name].to_json() for column_name in columns}
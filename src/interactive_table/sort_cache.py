@@ -0,0 +1,196 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+def _descending(order, sorted_ranks):
+    # reverse the order of tied blocks, but keep the order within each block
+    num_values = len(order)
+    boundaries = np.flatnonzero(np.diff(sorted_ranks)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [num_values]))
+    block = np.repeat(np.arange(len(starts)), ends - starts)
+    offset = np.arange(num_values) - starts[block]
+    descending = np.empty_like(order)
+    descending[num_values - ends[block] + offset] = order
+    return descending
+
+
+class SortCache:
+    """Lazily computed per-column sort orders of a dataframe.
+
+    Columns are referred to by name, the dataframe index by ``pd.Index``.
+    Orders are stable and place missing values last, also when sorting in
+    descending order. Results may be
+    computed in a worker thread, they are only cached if their column was
+    not invalidated in the meantime.
+    """
+
+    def __init__(self, dataframe):
+        self.dataframe = dataframe
+        self._encodings = {}
+        self._ranks = {}
+        self._orders = {}
+        self._sorted_values = {}
+        self._versions = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _values(self, column):
+        if column is pd.Index:
+            return self.dataframe.index
+        return self.dataframe[column]
+
+    def _version(self, column):
+        return self._generation, self._versions.get(column, 0)
+
+    def _cached(self, cache, key, column, compute):
+        result = cache.get(key)
+        if result is not None:
+            return result
+        version = self._version(column)
+        result = compute()
+        with self._lock:
+            if self._version(column) == version:
+                cache[key] = result
+        return result
+
+    def _encode(self, column):
+        def compute():
+            values = self._values(column)
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # reuse the codes of categorical columns without copying them
+                categorical = values.array
+                return categorical.codes, categorical.categories, True
+            try:
+                return (*pd.factorize(values, sort=True), True)
+            except TypeError:
+                # mixed types that cannot be compared
+                return (*pd.factorize(values), False)
+
+        return self._cached(self._encodings, column, column, compute)
+
+    def encoding(self, column):
+        """Dictionary encoding of a column as integer codes and unique values.
+
+        ``uniques[codes]`` are the values of the column, missing values have
+        the code -1. Categorical columns reuse their categories and codes.
+        """
+        codes, uniques, _ = self._encode(column)
+        return codes, uniques
+
+    def _rank_values(self, column):
+        def compute():
+            codes, uniques, is_sorted = self._encode(column)
+            if not is_sorted:
+                values = self._values(column)
+                codes, uniques = pd.factorize(
+                    np.where(pd.isna(values), None, values.astype(str)), sort=True
+                )
+            # missing values rank after all other values
+            return np.where(codes < 0, len(uniques), codes), len(uniques)
+
+        return self._cached(self._ranks, column, column, compute)
+
+    def ranks(self, column):
+        ranks, _ = self._rank_values(column)
+        return ranks
+
+    def _descending_ranks(self, column):
+        # reverse the ranks of all values but the missing ones
+        ranks, missing_rank = self._rank_values(column)
+        return np.where(ranks == missing_rank, missing_rank, missing_rank - 1 - ranks)
+
+    def order(self, column, descending=False):
+        def compute():
+            if not descending:
+                return np.argsort(self.ranks(column), kind="stable")
+            order = self.order(column)
+            ranks, missing_rank = self._rank_values(column)
+            # the missing values form the last block of the ascending order
+            stop = len(order) - np.count_nonzero(ranks == missing_rank)
+            return np.concatenate(
+                (_descending(order[:stop], ranks[order[:stop]]), order[stop:])
+            )
+
+        return self._cached(self._orders, (column, descending), column, compute)
+
+    def sorted_values(self, column):
+        def compute():
+            values = np.asarray(self._values(column))
+            return values[self.order(column)]
+
+        return self._cached(self._sorted_values, column, column, compute)
+
+    def range_positions(self, column, lower, upper):
+        """Row positions with values in the closed interval [lower, upper]."""
+        sorted_values = self.sorted_values(column)
+        start = np.searchsorted(sorted_values, lower, side="left")
+        stop = np.searchsorted(sorted_values, upper, side="right")
+        return self.order(column)[start:stop]
+
+    def quantiles(self, column, q):
+        """Linearly interpolated quantiles, equivalent to ``np.nanquantile``."""
+        codes, _ = self.encoding(column)
+        # missing values are sorted last and ignored
+        sorted_values = self.sorted_values(column)[: np.count_nonzero(codes >= 0)]
+        if len(sorted_values) == 0:
+            return np.full(len(q), np.nan)
+        virtual_index = (len(sorted_values) - 1) * np.asarray(q, dtype=float)
+        previous = np.floor(virtual_index).astype(int)
+        following = np.minimum(previous + 1, len(sorted_values) - 1)
+        t = virtual_index - previous
+        a = sorted_values[previous].astype(float)
+        b = sorted_values[following].astype(float)
+        return np.where(t >= 0.5, b - (b - a) * (1 - t), a + (b - a) * t)
+
+    def invalidate(self, column=None):
+        with self._lock:
+            if column is None:
+                self._generation += 1
+                self._encodings.clear()
+                self._ranks.clear()
+                self._orders.clear()
+                self._sorted_values.clear()
+                return
+            self._versions[column] = self._versions.get(column, 0) + 1
+            self._encodings.pop(column, None)
+            self._ranks.pop(column, None)
+            self._sorted_values.pop(column, None)
+            self._orders.pop((column, False), None)
+            self._orders.pop((column, True), None)
+
+    def sort(self, positions, columns, descending):
+        """Sort row positions by one or more columns.
+
+        Parameters
+        ----------
+        positions : np.ndarray
+            Integer row positions to sort.
+        columns : sequence
+            Columns to sort by, in order of priority.
+        descending : sequence of bool
+            Sort direction for each column.
+
+        Returns
+        -------
+        np.ndarray
+            The sorted row positions.
+        """
+        positions = np.asarray(positions)
+        if len(columns) == 0:
+            return positions
+        if len(columns) == 1:
+            order = self.order(columns[0], descending=bool(descending[0]))
+            if len(positions) == len(order):
+                return order
+            selected = np.zeros(len(order), dtype=bool)
+            selected[positions] = True
+            return order[selected[order]]
+        # np.lexsort treats the last key as the primary key
+        keys = [
+            (self._descending_ranks(column) if desc else self.ranks(column))[positions]
+            for column, desc in zip(reversed(columns), reversed(descending))
+        ]
+        return positions[np.lexsort(keys)]
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+
+def _trigrams(text):
+    return {text[start : start + 3] for start in range(len(text) - 2)}
+
+
+class TextIndex:
+    """Case-insensitive substring search over text columns of a dataframe.
+
+    An inverted index maps the trigrams of the unique values of each column
+    to the values containing them, and is built when a column is searched
+    first. Matching values are mapped to rows through the dictionary
+    encoding of the sort cache, so rows are never scanned as strings.
+    """
+
+    def __init__(self, sort_cache, columns):
+        self.sort_cache = sort_cache
+        self.columns = list(columns)
+        self._postings = {}
+        self._values = {}
+
+    def _index(self, column):
+        if column not in self._postings:
+            self._postings[column] = {}
+            self._values[column] = set()
+            _, uniques = self.sort_cache.encoding(column)
+            for value in uniques.tolist():
+                self.add(column, value)
+        return self._postings[column]
+
+    def add(self, column, value):
+        """Index a value that was written to a column."""
+        if column not in self._postings or pd.isna(value):
+            return
+        if value in self._values[column]:
+            return
+        self._values[column].add(value)
+        for trigram in _trigrams(str(value).casefold()):
+            self._postings[column].setdefault(trigram, set()).add(value)
+
+    def matching_values(self, column, text):
+        text = text.casefold()
+        postings = self._index(column)
+        trigrams = _trigrams(text)
+        if len(trigrams) == 0:
+            candidates = self._values[column]
+        else:
+            candidates = sorted(
+                (postings.get(trigram, set()) for trigram in trigrams), key=len
+            )
+            candidates = set.intersection(*candidates)
+        # values removed by edits stay indexed, they simply match no rows
+        return [value for value in candidates if text in str(value).casefold()]
+
+    def search(self, text):
+        """Mask of the rows with a value containing the text in any column."""
+        mask = np.zeros(len(self.sort_cache.dataframe), dtype=bool)
+        for column in self.columns:
+            codes, uniques = self.sort_cache.encoding(column)
+            values = self.matching_values(column, text)
+            if len(values) == 0:
+                continue
+            matches = np.zeros(len(uniques) + 1, dtype=bool)
+            matches[:-1] = pd.Index(uniques).isin(values)
+            mask |= matches[codes]
+        return mask
+
+    def search_rows(self, text, positions):
+        """Mask of the rows at some positions with a value containing the text.
+
+        Only the values of these rows are compared, e.g., after they were
+        edited, without the encodings of the columns.
+        """
+        text = text.casefold()
+        mask = np.zeros(len(positions), dtype=bool)
+        for column in self.columns:
+            values = self.sort_cache.dataframe[column].iloc[positions]
+            codes, uniques = pd.factorize(values)
+            matches = np.zeros(len(uniques) + 1, dtype=bool)
+            matches[:-1] = [text in str(value).casefold() for value in uniques]
+            mask |= matches[codes]
+        return mask
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+
+def _encode_values(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categorical = pd.Categorical(values)
+        return (
+            {"kind": "dictionary", "dictionary": categorical.categories.tolist()},
+            np.ascontiguousarray(categorical.codes, dtype="<i4"),
+        )
+    values = np.asarray(values)
+    if values.dtype == bool:
+        return {"kind": "bool"}, np.packbits(values, bitorder="little")
+    if np.issubdtype(values.dtype, np.integer):
+        return {"kind": "int64"}, np.ascontiguousarray(values, dtype="<i8")
+    if np.issubdtype(values.dtype, np.floating):
+        return {"kind": "float64"}, np.ascontiguousarray(values, dtype="<f8")
+    codes, uniques = pd.factorize(values)
+    return (
+        {"kind": "dictionary", "dictionary": uniques.tolist()},
+        np.ascontiguousarray(codes, dtype="<i4"),
+    )
+
+
+def encode_columns(dataframe, index, columns=None):
+    """Encode rows of a dataframe as typed column buffers.
+
+    Numeric columns are sent as little-endian int64 or float64 arrays,
+    boolean columns as bitmaps and categorical or object columns as int32
+    codes into a dictionary of values (code -1 denotes a missing value).
+
+    Parameters
+    ----------
+    dataframe : pd.DataFrame
+        The dataframe to encode.
+    index : pd.Index
+        Index of the rows to encode, in display order.
+    columns : list of str, optional
+        The columns to encode, defaults to all columns.
+
+    Returns
+    -------
+    tuple of dict and list of memoryview
+        The header describing the columns and one buffer per column.
+    """
+    if columns is None:
+        columns = dataframe.columns.tolist()
+    positions = dataframe.index.get_indexer(index)
+    header = {"num_rows": len(index), "columns": []}
+    buffers = []
+    for column_name in ["index"] + list(columns):
+        if column_name == "index":
+            values = index
+        else:
+            values = dataframe[column_name].iloc[positions]
+        description, buffer = _encode_values(values)
+        header["columns"].append({"name": column_name, **description})
+        buffers.append(memoryview(buffer))
+    return header, buffers
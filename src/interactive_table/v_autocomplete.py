@@ -1,6 +1,8 @@
 import ipyvuetify as v
 import traitlets
 
+from .prefix_index import SearchableValues
+
 
 class Autocomplete(v.VuetifyTemplate):  # type: ignore
     selection = traitlets.Any().tag(sync=True)
@@ -11,6 +13,39 @@ class Autocomplete(v.VuetifyTemplate):  # type: ignore
     label = traitlets.Unicode().tag(sync=True)
     class_ = traitlets.Unicode().tag(sync=True)
     style_ = traitlets.Unicode().tag(sync=True)
+    server_search = traitlets.Bool().tag(sync=True)
+
+    # more values than this are searched in the kernel instead of the browser
+    max_items = 1000
+    searchable_values = None
+
+    def set_values(self, values):
+        values = SearchableValues(values, self.max_items)
+        if not values.is_capped:
+            self.searchable_values = None
+            self.server_search = False
+            self.items = values.values
+            return
+        self.searchable_values = values
+        self.server_search = True
+        self._set_matches()
+
+    def _set_matches(self):
+        if self.selection is None:
+            selection = []
+        elif self.multiple:
+            selection = list(self.selection)
+        else:
+            selection = [self.selection]
+        # selected values stay available, even if they do not match the search
+        matches = self.searchable_values.search(self.search)
+        self.items = selection + [match for match in matches if match not in selection]
+
+    @traitlets.observe("search")
+    def _on_search_change(self, change):
+        if self.searchable_values is None or change["old"] == change["new"]:
+            return
+        self._set_matches()
 
     @traitlets.default("template")
     def _template(self):
@@ -22,6 +57,7 @@ class Autocomplete(v.VuetifyTemplate):  # type: ignore
     :style="style_"
     :search-input.sync="search"
     :items="items"
+    :no-filter="server_search"
     :label="label"
     :multiple="multiple"
     :chips="chips"
@@ -1,9 +1,12 @@
 from contextlib import contextmanager
 
 import lazyfilter
+import numpy as np
 import pandas as pd
 import traitlets
 
+from .backends import PandasBackend
+from .scheduler import UpdateScheduler
 from .traitlet_utils import MutableDict
 from .v_badge_toggle import BadgeToggle
 from .v_menu import Menu
@@ -21,59 +24,117 @@ class _DataFrameFilter(traitlets.HasTraits, lazyfilter.DataFrameFilter):
         self.track_description = track_description
         self.widgets = {}
         self.callbacks = callbacks
+        # lazy_filter creates the filter from the dataframe alone, so tables
+        # assign their backend before it is used
+        self._backend = None
+        self.scheduler = UpdateScheduler(self.update)
+        self.runner = None
+        self.search_mask = None
+        self._filter_widgets = {}
+        self._masks = {}
+        self._column_versions = {}
+        self._widget_versions = {}
+        self._deferred_change = None
+        self._deferred_evaluation = False
 
     def add(self, filter, *, dependencies=None):
+        super().add(filter, dependencies=dependencies)
+        # describe filter, but temporarily deactivate callbacks for initial description
+        callbacks = self.callbacks
+        self.callbacks = None
+        self.describe(filter)
+        self.callbacks = callbacks
+
+    def widget(self, filter):
+        if filter in self.widgets:
+            return self.widgets[filter]
+        # the filter widget is only built when the menu is opened
+        filter_menu = Menu(
+            open_button="mdi-filter",
+            open_button_icon=True,
+            open_button_class="ml-n4 my-0",
+            close_button="",
+            confirm_button="",
+            content=[],
+            on_open_callbacks=[lambda: self.filter_widget(filter) is not None],
+        )
+        widget = BadgeToggle(
+            content=filter_menu,
+            on_deactivate_callbacks=[
+                lambda: self.filter_widget(filter).reset(),
+                filter.reset,
+            ],
+        )
+        self.widgets[filter] = widget
+        widget.active = self.is_filtering(filter)
+        return widget
+
+    def filter_widget(self, filter):
+        if filter in self._filter_widgets:
+            return self._filter_widgets[filter]
+
         def callback(selection):
-            self.update({filter.column: selection})
+            self.scheduler.schedule({filter.column: selection})
 
-        super().add(filter, dependencies=dependencies)
-        column_name = self.column_name(filter)
         if filter.selected_values is None:
             filter_widget = RangeFilter(
-                values=filter.values,
+                values=self._widget_values(filter),
                 allow_quantile_range_filter=filter.column != pd.Index,
-                callbacks=[callback],
                 class_="px-5 pt-5 pb-1",
                 style_="width: 300px",
             )
         else:
             filter_widget = SelectionFilter(
-                values=filter.values,
-                callbacks=[callback],
+                values=[],
                 class_="px-5 pt-5 pb-0",
                 style_="width: 300px",
-                label=f"Select {column_name}",
+                label=f"Select {self.column_name(filter)}",
             )
-        filter_menu = Menu(
-            open_button="mdi-filter",
-            open_button_icon=True,
-            open_button_class="ml-n4 my-0",
-            close_button="",
-            confirm_button="",
-            content=[filter_widget],
-        )
-        widget = BadgeToggle(
-            content=filter_menu,
-            on_deactivate_callbacks=[filter_widget.reset, filter.reset],
-        )
-        self.widgets[filter] = widget
-        # describe filter, but temporarily deactivate callbacks for initial description
-        callbacks = self.callbacks
-        self.callbacks = None
-        self.describe(filter)
-        self.callbacks = callbacks
+            self._assign_widget_values(filter, filter_widget)
+        if filter.is_active:
+            filter_widget.value = filter.value
+        filter_widget.callbacks = [callback]
+        self._widget_versions[filter] = self.statistics.version(filter.column)
+        self._filter_widgets[filter] = filter_widget
+        self.widget(filter).content.content = [filter_widget]
+        return filter_widget
+
+    def _widget_values(self, filter):
+        if self.dependencies.get(filter):
+            # the values of dependent filters change with their dependencies
+            return filter.values
+        # the widgets only need the unique values or the bounds
+        if filter.selected_values is None:
+            return list(self.backend.column_stats(filter.column))
+        return list(self.backend.uniques(filter.column))
+
+    def _set_widget_values(self, filter, widget):
+        version = self.statistics.version(filter.column)
+        if (
+            not self.dependencies.get(filter)
+            and self._widget_versions.get(filter) == version
+        ):
+            return
+        self._widget_versions[filter] = version
+        self._assign_widget_values(filter, widget)
+
+    def _assign_widget_values(self, filter, widget):
+        values = self._widget_values(filter)
+        if isinstance(widget, SelectionFilter) and not self.dependencies.get(filter):
+            # the unique values of the statistics are sorted already
+            widget.set_unique_values(values)
+            return
+        widget.values = values
 
     def is_filtering(self, filter):
         if not filter.is_active:
             return False
-        widget = self.widgets[filter].content.content[0]
         if filter.filter_type == "quantile_range" and filter.value == (0, 1):
             return False
-        if filter.filter_type == "value_range" and filter.value == (
-            widget.min,
-            widget.max,
-        ):
-            return False
+        if filter.filter_type == "value_range":
+            widget = self.filter_widget(filter)
+            if filter.value == (widget.min, widget.max):
+                return False
         if (
             filter.filter_type == "selected_values"
             and (value := filter.value) is not None
@@ -83,7 +144,9 @@ class _DataFrameFilter(traitlets.HasTraits, lazyfilter.DataFrameFilter):
         return True
 
     def _set_active(self, filter):
-        self.widgets[filter].active = self.is_filtering(filter)
+        active = self.is_filtering(filter)
+        if filter in self.widgets or active:
+            self.widget(filter).active = active
 
     @contextmanager
     def block_callbacks(self):
@@ -96,26 +159,143 @@ class _DataFrameFilter(traitlets.HasTraits, lazyfilter.DataFrameFilter):
         finally:
             self.callbacks = _callbacks
 
+    @contextmanager
+    def batch(self):
+        """Merge description changes and evaluate the filters once at the end."""
+        if self._deferred_change is not None:
+            yield
+            return
+        self._deferred_change = {"old": {}, "new": {}}
+        self._deferred_evaluation = False
+        try:
+            yield
+        finally:
+            change = self._deferred_change
+            self._deferred_change = None
+            if len(change["new"]) > 0:
+                # changes made with blocked callbacks are not evaluated
+                callbacks = self.callbacks if self._deferred_evaluation else None
+                with self.block_callbacks():
+                    self.callbacks = callbacks
+                    self._description_change(change)
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = PandasBackend(self.dataframe)
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend):
+        self._backend = backend
+
+    @property
+    def sort_cache(self):
+        return self.backend.sort_cache
+
+    @property
+    def statistics(self):
+        return self.backend.statistics
+
+    def _evaluate(self, filter):
+        if filter.filter_type == "quantile_range" and self.dependencies.get(filter):
+            # quantiles of the values that pass the dependencies
+            value_range = np.nanquantile(np.asarray(filter.values), filter.value)
+            return self.backend.mask(filter.column, "value_range", value_range)
+        return self.backend.mask(filter.column, filter.filter_type, filter.value)
+
+    def _mask(self, filter):
+        key = (
+            filter.filter_type,
+            tuple(filter.value),
+            self._column_versions.get(filter.column, 0),
+        )
+        cached_key, mask = self._masks.get(filter, (None, None))
+        if cached_key == key:
+            return mask
+        mask = self._evaluate(filter)
+        if filter.filter_type == "quantile_range" and self.dependencies.get(filter):
+            # quantiles of dependent filters change with their dependencies
+            return mask
+        if self._column_versions.get(filter.column, 0) == key[-1]:
+            # masks evaluated in the background are dropped after edits
+            self._masks[filter] = (key, mask)
+        return mask
+
+    def invalidate(self, column, replaced=None):
+        """Drop cached results of a column after its values changed.
+
+        Statistics are updated incrementally if the ``(old, new)`` pair of a
+        single replaced value is given and recomputed otherwise.
+        """
+        self._column_versions[column] = self._column_versions.get(column, 0) + 1
+        self.sort_cache.invalidate(column)
+        if replaced is None:
+            self.statistics.invalidate(column)
+        else:
+            self.statistics.replace(column, *replaced)
+
+    def filtered_index(self):
+        active_filters = [filter for filter in self.dependencies if filter.is_active]
+        if any(
+            filter.filter_type
+            not in ("selected_values", "value_range", "quantile_range")
+            for filter in active_filters
+        ):
+            index = self.apply(track_description=False).index
+            if self.search_mask is None:
+                return index
+            return index[self.search_mask[self.dataframe.index.get_indexer(index)]]
+        mask = (
+            np.ones(len(self.dataframe), dtype=bool)
+            if self.search_mask is None
+            else self.search_mask.copy()
+        )
+        for filter in active_filters:
+            if filter.value is None:
+                # as in is_filtering, e.g., a selection that was not made yet
+                continue
+            mask &= self._mask(filter)
+        return self.dataframe.index[mask]
+
+    def evaluate(self, callbacks):
+        def invoke_callbacks(index):
+            for callback in callbacks:
+                callback(index)
+
+        if self.runner is None:
+            invoke_callbacks(self.filtered_index())
+            return
+        self.runner.submit(self.filtered_index, invoke_callbacks, kind="filter")
+
     @traitlets.observe("description", type="mutation")
     def _description_change(self, change):
+        if self._deferred_change is not None:
+            for key in change["new"]:
+                self._deferred_change["old"].setdefault(key, change["old"][key])
+                self._deferred_change["new"][key] = change["new"][key]
+            if self.callbacks is not None:
+                self._deferred_evaluation = True
+            return
         for key in change["new"]:
             column, _, options, value = change["new"][key]
             set_value = True
             if str(change["old"][key]) != "Undefined":
                 set_value = value != change["old"][key][3]
             filter = self.get(column)
-            widget = self.widgets[filter].content.content[0]
-            widget.values = filter.values
+            if filter not in self._filter_widgets and not filter.is_active:
+                self._set_active(filter)
+                continue
+            widget = self.filter_widget(filter)
+            self._set_widget_values(filter, widget)
             if set_value and filter.is_active and widget.value != value:
                 widget.value = value
             elif not filter.is_active and widget.is_active:
                 widget.reset()
             self._set_active(filter)
-        filtered_dataframe = self.apply(track_description=False)
         if self.callbacks is None:
             return
-        for callback in self.callbacks:
-            callback(filtered_dataframe)
+        self.evaluate(self.callbacks)
 
 
 lazyfilter.lazy.DataFrameFilter = _DataFrameFilter
@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from typing import Any
 
 import ipyvuetify as v
@@ -7,223 +8,78 @@ import pandas as pd
 import traitlets
 from lazyfilter.utils import HasValidDataframe
 
+from .backends import PandasBackend
+from .edit_log import EditLog
+from .patches import apply_patch, compute_patch
+from .prefix_index import SearchableValues
+from .scheduler import BackgroundRunner, UpdateScheduler
+from .text_index import TextIndex
+from .transport import encode_columns
 from .v_dataframe_filter import _DataFrameFilter, lazy_filter
 
 
-def cast(value, dtype):
-    try:
-        if dtype == "bool":
-            value = str(value).lower() == "true"
-        elif dtype == "int":
-            value = int(value)
-        elif dtype == "float":
-            value = float(value)
-        elif dtype == "O":
-            value = str(value)
-        elif isinstance(dtype, pd.CategoricalDtype):
-            categories = dtype.categories
-            value, _ = cast(value, categories.dtype)
-            if value not in categories:
-                dtype = pd.CategoricalDtype(list(categories) + [value])
-    except ValueError:
-        raise ValueError("Unsupported type")
-    return value, dtype
-
-
-def parse_dtype(dataframe, column_name):
-    dtype = dataframe[column_name].dtype
-    is_bool = dtype == "bool"
-    is_int = "int" in str(dtype)
-    is_float = "float" in str(dtype)
-    is_categorical = isinstance(dtype, pd.CategoricalDtype)
-    is_string = dtype == "O"
-    if sum(map(int, [is_bool, is_int, is_float, is_categorical, is_string])) != 1:
-        raise ValueError(f"{column_name} has unsupported dtype {dtype}")
-    return dtype, {
-        "bool": is_bool,
-        "int": is_int,
-        "float": is_float,
-        "categorical": is_categorical,
-        "O": is_string,
-    }
+def _frame_items(frame):
+    return [
+        {"index": idx, **item, "actions": None}
+        for idx, item in zip(frame.index, frame.to_dict(orient="records"))
+    ]
 
 
 class _TableDisplay(HasValidDataframe, v.VuetifyTemplate):  # type: ignore
+    # a generic template that renders cells based on the column schema, so
+    # that all tables share the same template file
+    template_file = (__file__, "templates/TableDisplay.vue")
+    # larger sets of unique values are searched in the kernel by the editor
+    max_uniques = 1000
+
     selected = traitlets.Any().tag(sync=True)
     headers = traitlets.Any().tag(sync=True)
     items = traitlets.List().tag(sync=True)
     uniques = traitlets.Dict().tag(sync=True)
+    searchable_uniques = traitlets.List().tag(sync=True)
     input_error = traitlets.Any().tag(sync=True)
+    column_schema = traitlets.Dict().tag(sync=True)
     filter_widgets = traitlets.List().tag(sync=True, **widgets.widget_serialization)
     editing = traitlets.Bool().tag(sync=True)
     show_filter_snackbar = traitlets.Bool().tag(sync=True)
     filter_snackbar_timeout = traitlets.Int().tag(sync=True)
     fullscreen_icon = traitlets.Unicode().tag(sync=True)
     action_dialogs = traitlets.List().tag(sync=True, **widgets.widget_serialization)
+    action_names = traitlets.List().tag(sync=True)
 
     editable = traitlets.Bool().tag(sync=True)
+    can_undo = traitlets.Bool().tag(sync=True)
+    can_redo = traitlets.Bool().tag(sync=True)
     filterable = traitlets.Bool().tag(sync=True)
     allow_fullscreen = traitlets.Bool().tag(sync=True)
+    searchable = traitlets.Bool().tag(sync=True)
+    search = traitlets.Unicode(allow_none=True).tag(sync=True)
 
-    @traitlets.default("template")
-    def _template(self):
-        return f"""
-            <v-template>
-                <v-data-table
-                    :headers="headers"
-                    :items="items"
-                    item-key="index"
-                    multi-sort
-                    :footer-props="{{
-                        showFirstLastPage: true,
-                        itemsPerPageOptions: [5, 10, 15, 25, 50, -1],
-                    }}"
-                    :items-per-page=10
-                    >
-                    {
-            "\n".join(
-                [
-                    self._generate_input_slot_template(header_item["value"])
-                    for header_item in self.headers
-                    if header_item["value"] != "index"
-                ]
-            )
-        }
-                    <template v-if="filterable" slot="header" :headers="headers">
-                        <tr>
-                            <th v-for="(header, index) in headers"
-                                :key="header.value">
-                                <jupyter-widget :widget="filter_widgets[index]" />
-                            </th>
-                        </tr>
-                    </template>
-
-                    <template v-if="allow_fullscreen" v-slot:footer>
-                        <v-btn
-                            fab
-                            icon
-                            small
-                            elevation=0
-                            absolute
-                            center
-                            left
-                            class="mt-3"
-                            @click="toggle_fullscreen"
-                        >
-                            <v-icon>{{{{ fullscreen_icon }}}}</v-icon>
-                        </v-btn>
-                    </template>
-
-                </v-data-table>
-
-                <v-snackbar
-                    v-model="show_filter_snackbar"
-                    :timeout="filter_snackbar_timeout"
-                    color="white"
-                    >
-                    <div class="black--text">Apply filters?</div>
-                    <v-spacer></v-spacer>
-                    <v-btn text color="primary" @click="show_filter_snackbar = false">No</v-btn>
-                    <v-btn text color="primary" @click="apply_filters">Yes</v-btn>
-                </v-snackbar>
-
-                <jupyter-widget v-for="dialog in action_dialogs" :widget="dialog" />
-
-            </v-template>
-            """
+    server_side = traitlets.Bool().tag(sync=True)
+    options = traitlets.Dict().tag(sync=True)
+    server_items_length = traitlets.Int().tag(sync=True)
+    loading = traitlets.Bool().tag(sync=True)
+
+    virtual_scroll = traitlets.Bool().tag(sync=True)
+    row_offset = traitlets.Int().tag(sync=True)
+    row_height = traitlets.Int(default_value=48).tag(sync=True)
+
+    column_window = traitlets.Int().tag(sync=True)
+    column_offset = traitlets.Int().tag(sync=True)
+    column_count = traitlets.Int().tag(sync=True)
 
     def vue_action_click(self, args):
         item, action_name = args
+        # items only hold the displayed columns, actions get the full row
+        (item,) = self._get_items(index=[item["index"]], columns=self.dataframe.columns)
         self.actions[action_name](item)
 
-    def _generate_input_slot_template(self, column_name):
-        if column_name == "actions":
-            return f"""
-                <template v-slot:item.{column_name}="props">
-                    <div class="d-inline-flex flex-row flex-nowrap align-self-start">
-                        {
-                "\n".join(
-                    [
-                        f"""
-                                    <v-btn
-                                        icon
-                                        @click.native.stop="action_click([props.item, '{action_name}'])"
-                                        >
-                                        <v-icon>{action_name}</v-icon>
-                                    </v-btn>
-                                    """
-                        for action_name in self.actions
-                    ]
-                )
-            }
-                    </div>
-                </template>
-                """
-        dtype, topts = parse_dtype(self.dataframe, column_name)
-        if not self.editable:
-            return f"""
-                <template v-slot:item.{column_name}="props">
-                    <v-hover v-slot="{{ hover }}">
-                        <div :class="hover ? 'primary--text' : ''">
-                            {f"{{{{ props.item.{column_name} }}}}" if not topts["float"] else f"{{{{ props.item.{column_name}.toFixed(3) }}}}"}
-                        </div>
-                    </v-hover>
-                </template>
-                """
-        text_field = f"""
-            <v-text-field
-                v-model="props.item.{column_name}"
-                :rules="[validate_{column_name}]"
-                :error-messages="input_error"
-                type="{"number" if topts["float"] or topts["int"] else "text"}"
-                step={1 if topts["int"] else 0.1}
-                >
-            </v-text-field>
-            """
-        selection = f"""
-            <v-autocomplete
-                :items="uniques.{column_name}"
-                v-model="props.item.{column_name}"
-            >
-            </v-autocomplete>
-            """
-        checkbox = f"""
-            <v-simple-checkbox
-                v-model="props.item.{column_name}"
-                >
-            </v-simple-checkbox>
-            """
-        dialog = f"""
-            <v-edit-dialog
-                save-text="OK"
-                large
-                lazy
-                :return-value.sync="props.item.{column_name}"
-                @open="editing = true"
-                @save="on_edit_submit"
-                @close="on_edit_close"
-                >
-                    <v-hover v-slot="{{ hover }}">
-                        <div :class="hover ? 'primary--text' : ''">
-                            {f"{{{{ props.item.{column_name} }}}}" if not topts["float"] else f"{{{{ props.item.{column_name}.toFixed(3) }}}}"}
-                        </div>
-                    </v-hover>
-                    <template v-slot:input>
-                        {selection if topts["categorical"] else text_field}
-                    </template>
-            </v-edit-dialog>
-            """
-        return f"""
-            <template v-slot:item.{column_name}="props">
-                {checkbox if topts["bool"] else dialog}
-            </template>
-            """
-
     def __init__(
         self,
         data_table,
         dataframe,
         *,
+        backend,
         filter_dependencies,
         show_index,
         show_actions,
@@ -233,77 +89,160 @@ class _TableDisplay(HasValidDataframe, v.VuetifyTemplate):  # type: ignore
         editable,
         filterable,
         allow_fullscreen,
+        server_side,
+        binary_transport,
+        filter_delay,
+        background,
+        column_window,
+        virtual_scroll,
+        searchable,
     ):
+        # tables of a query backend show one page of its rows at a time
+        self._query_backend = backend
+        if (dataframe is None) == (backend is None):
+            raise ValueError("Pass either a dataframe or a backend.")
+        if backend is not None:
+            if not server_side:
+                raise ValueError("Tables of a backend are paged on the server.")
+            unsupported = [
+                name
+                for name, value in [
+                    ("actions", actions),
+                    ("editing", editable),
+                    ("filtering", filterable),
+                    ("searching", searchable),
+                    ("virtual scrolling", virtual_scroll),
+                    ("binary transport", binary_transport),
+                ]
+                if value
+            ]
+            if unsupported:
+                raise ValueError(
+                    f"Tables of a backend do not support {', '.join(unsupported)}."
+                )
+            # the displayed dataframe only holds the columns and their dtypes
+            dataframe = backend.page(limit=0)
+            self._num_rows = backend.count()
         self._data_table = data_table
         self.fullscreen_icon = "mdi-fullscreen"
         self.actions = {} if actions is None else actions
         self.action_dialogs = [] if action_dialogs is None else action_dialogs
+        self.action_names = list(self.actions)
         self.dataframe = dataframe
+        self.backend = PandasBackend(self.dataframe)
+        self.schema = self.backend.schema
+        self.edit_log = EditLog(self.dataframe)
         self.selected = []
+        self.options = {"page": 1, "itemsPerPage": 10, "sortBy": [], "sortDesc": []}
+        self._sort_cache = self.backend.sort_cache
+        self._sorted_index = None
+        # the rows shown in the browser, which differ from the synced items
+        # once they have been patched
+        self._rows = []
+        self._item_positions = None
+        self._item_index = pd.Index([])
+        self._dirty_index = set()
+        self._items_patched = False
+        self._batch_columns = None
+        self._batch_show = False
+        self._unique_values = {}
+        self.binary_transport = binary_transport
+        self._runner = (
+            BackgroundRunner(on_busy=self._set_loading) if background else None
+        )
+        self.server_side = server_side
+        self._row_window = (0, 20)
+        self.virtual_scroll = virtual_scroll
         if visible_columns is None:
             visible_columns = self.dataframe.columns.tolist()
-        self._set_headers(
-            show_index=show_index,
-            show_actions=show_actions,
-            visible_columns=visible_columns,
-        )
+        self._show_index = show_index
+        self._show_actions = show_actions
+        self._visible_columns = [
+            column for column in self.dataframe.columns if column in visible_columns
+        ]
+        self.column_count = len(self._visible_columns)
+        self.column_window = 0 if column_window is None else column_window
+        self._set_headers()
         self._set_items()
         self.lazyfilter = lazy_filter(
             self,
             dependencies=filter_dependencies,
             track_description=True,
-            callbacks=[lambda dataframe: self._set_items(index=dataframe.index)],
+            callbacks=[lambda index: self._set_items(index=index)],
         )
         assert isinstance(self.lazyfilter, _DataFrameFilter)
         # make sure that this is the monkey-patched data frame filter class
-        self.filter_widgets = [
-            self.lazyfilter.widgets[filter]
-            for filter in self.lazyfilter.dependencies
-            if filter.column in [pd.Index] + visible_columns
-        ]
-        for header_item in self.headers:
-            column_name = header_item["value"]
-            if column_name in ["index", "actions"]:
-                continue
-
-            def validation_func(value, column_name=column_name):
-                return self._validate(column_name, value)
-
-            setattr(self, f"vue_validate_{column_name}", validation_func)
-            dtype, topts = parse_dtype(self.dataframe, column_name)
-            if topts["categorical"]:
-                self.uniques[column_name] = list(dtype.categories)  # type: ignore
-            elif topts["O"]:
-                self.uniques[column_name] = np.unique(
-                    self.dataframe[column_name]
-                ).tolist()
+        self.lazyfilter.backend = self.backend
+        self.lazyfilter.scheduler.delay = filter_delay
+        self.lazyfilter.runner = self._runner
+        self._set_filter_widgets()
+        self._view_scheduler = UpdateScheduler(
+            self._apply_view_updates, delay=filter_delay
+        )
+        for column_name in self._visible_columns:
+            self.column_schema[column_name] = self.schema[column_name].to_json()
+            self._set_uniques(column_name)
+        self._text_index = TextIndex(
+            self._sort_cache,
+            [
+                column_name
+                for column_name in self._visible_columns
+                if self.schema[column_name].kind in ("string", "categorical")
+            ],
+        )
+        # the text of the current search mask
+        self._searched = None
 
         self.editable = editable
         self.filterable = filterable
         self.allow_fullscreen = allow_fullscreen
+        self.searchable = searchable
 
         v.VuetifyTemplate.__init__(self)  # type: ignore
 
-    def _validate(self, column_name, value):
-        dtype, topts = parse_dtype(self.dataframe, column_name)
-        if topts["int"]:
-            try:
-                cast(str(value), dtype)
-                self.input_error = None
-            except ValueError:
-                self.input_error = "Input must be whole number."
-                return False
-        if topts["float"]:
-            try:
-                cast(str(value), dtype)
-                self.input_error = None
-            except ValueError:
-                self.input_error = "Input must be numeric."
-        return True
-
-    def _set_headers(
-        self, *, show_index: bool, show_actions: bool, visible_columns: list[str]
-    ):
+    def _set_uniques(self, column_name):
+        kind = self.schema[column_name].kind
+        if kind == "categorical":
+            uniques = list(self.schema[column_name].categories)
+        elif kind == "string":
+            uniques = list(self.backend.uniques(column_name))
+        else:
+            return
+        values = SearchableValues(uniques, self.max_uniques)
+        uniques = values.search(None)
+        if values.is_capped:
+            # the editor searches the remaining values in the kernel
+            self._unique_values[column_name] = values
+            if column_name not in self.searchable_uniques:
+                self.searchable_uniques = self.searchable_uniques + [column_name]
+        else:
+            self._unique_values.pop(column_name, None)
+            if column_name in self.searchable_uniques:
+                self.searchable_uniques = [
+                    column
+                    for column in self.searchable_uniques
+                    if column != column_name
+                ]
+        if self.uniques.get(column_name) != uniques:
+            self.uniques = {**self.uniques, column_name: uniques}
+
+    def vue_search_uniques(self, data):
+        column_name, search = data
+        if column_name not in self._unique_values:
+            return
+        self.uniques = {
+            **self.uniques,
+            column_name: self._unique_values[column_name].search(search),
+        }
+
+    def _window_columns(self):
+        if self.column_window <= 0:
+            return self._visible_columns
+        return self._visible_columns[
+            self.column_offset : self.column_offset + self.column_window
+        ]
+
+    def _set_headers(self):
         def prepare_header(column):
             return (
                 column.replace("_min", " (min)")
@@ -312,62 +251,274 @@ class _TableDisplay(HasValidDataframe, v.VuetifyTemplate):  # type: ignore
                 .capitalize()
             )
 
+        columns = self._window_columns()
+        self._item_columns = columns
         headers: list[dict[str, Any]] = [
-            {"text": prepare_header(column), "value": column}
-            for column in self.dataframe.columns
-            if column in visible_columns
+            {"text": prepare_header(column), "value": column} for column in columns
         ]
-        if show_index:
-            headers = [{"text": "Index", "value": "index"}] + headers
-        if show_actions and len(self.actions) > 0:
+        if self._show_index:
+            index_header = {"text": "Index", "value": "index"}
+            if self._query_backend is not None:
+                # datasets number the rows of a query result and cannot sort by them
+                index_header["sortable"] = False
+            headers = [index_header] + headers
+        if self._show_actions and len(self.actions) > 0:
             headers.append({"text": "Actions", "value": "actions", "sortable": False})
         self.headers = headers
 
+    def _set_filter_widgets(self):
+        filters = {filter.column: filter for filter in self.lazyfilter.dependencies}
+        columns = [
+            pd.Index if header_item["value"] == "index" else header_item["value"]
+            for header_item in self.headers
+        ]
+        self.filter_widgets = [
+            self.lazyfilter.widget(filters[column])
+            for column in columns
+            if column in filters
+        ]
+
+    def _set_column_window(self):
+        self._set_headers()
+        self._set_filter_widgets()
+        # the displayed columns changed, so all rows have to be sent again
+        self._item_index = pd.Index([])
+
+    @traitlets.observe("column_offset")
+    def _on_column_offset_change(self, change):
+        if change["old"] == change["new"] or self.column_window <= 0:
+            return
+        self._view_scheduler.schedule({"column_offset": change["new"]})
+
     @property
     def current_index(self):
-        return pd.Index([item["index"] for item in self.items])
+        return self._view_index
 
-    def _get_items(self, *, index=None):
+    def _get_items(self, *, index=None, columns=None):
         if index is None:
             index = self.dataframe.index
-        return [
-            {"index": idx, **item, "actions": None}
-            for idx, item in zip(
-                index, self.dataframe.loc[index].to_dict(orient="records")
-            )
-        ]
+        if columns is None:
+            columns = self._item_columns
+        return _frame_items(self.dataframe.loc[index, columns])
 
     def _set_items(self, *, index=None):
-        self.items = self._get_items(index=index)
+        if index is None:
+            index = self.dataframe.index
+        self._view_index = index
+        self._sorted_index = None
+        if self.server_side or self.virtual_scroll:
+            self.server_items_length = self._view_length()
+        self._show_view()
+
+    def _view_length(self):
+        if self._query_backend is not None:
+            return self._num_rows
+        return len(self._view_index)
+
+    def _show_view(self):
+        if self.virtual_scroll:
+            self._set_row_window()
+        elif self.server_side:
+            self._set_page()
+        else:
+            self._show_items(self._view_index)
+
+    def _sort_index(self, index, sort_by, sort_desc):
+        if len(sort_by) == 0:
+            return index
+        positions = self.dataframe.index.get_indexer(index)
+        columns = [pd.Index if column == "index" else column for column in sort_by]
+        return self.dataframe.index[
+            self._sort_cache.sort(positions, columns, sort_desc)
+        ]
 
-    @traitlets.observe("items")
-    def _on_item_change(self, change):
-        if change["old"] == traitlets.Undefined:
+    def _get_sorted_index(self):
+        sort_by = tuple(self.options.get("sortBy", []))
+        sort_desc = tuple(self.options.get("sortDesc", []))
+        if self._sorted_index is None or self._sorted_index[0] != (sort_by, sort_desc):
+            self._sorted_index = (
+                (sort_by, sort_desc),
+                self._sort_index(self._view_index, sort_by, sort_desc),
+            )
+        return self._sorted_index[1]
+
+    def _set_page(self):
+        page = self.options.get("page", 1)
+        items_per_page = self.options.get("itemsPerPage", 10)
+        if items_per_page <= 0:
+            items_per_page = max(1, self._view_length())
+        num_pages = max(1, -(-self._view_length() // items_per_page))
+        if page > num_pages:
+            # the observer on options requests the clamped page
+            self.options = {**self.options, "page": num_pages}
             return
-        submit_changes = {}
-        for new_item in change["new"]:
-            row = {}
-            index = new_item["index"]
-            for column_name, value in new_item.items():
-                if column_name in ["index", "actions"]:
-                    continue
-                try:
-                    row[column_name], dtype = cast(
-                        str(value), self.dataframe[column_name].dtype
-                    )
-                    if dtype != self.dataframe[column_name].dtype:
-                        return
-                except ValueError:
-                    return
-            row = pd.Series(row, name=index)
-            if not (row == self.dataframe.loc[index]).all():
-                submit_changes[index] = row
-        changed = False
-        for index, row in submit_changes.items():
-            self.dataframe.loc[index] = row
-            changed = True
-        if not changed:
+        start = (page - 1) * items_per_page
+        if self._query_backend is not None:
+            self._show_query_page(start, items_per_page)
+            return
+        self._show_items(self._get_sorted_index()[start : start + items_per_page])
+
+    def _show_query_page(self, offset, limit):
+        # the worker thread must not read options that change meanwhile
+        sort_by = list(self.options.get("sortBy", []))
+        descending = list(self.options.get("sortDesc", []))
+        columns = self._item_columns
+
+        def query():
+            return _frame_items(
+                self._query_backend.page(
+                    sort_by=sort_by,
+                    descending=descending,
+                    offset=offset,
+                    limit=limit,
+                    columns=columns,
+                )
+            )
+
+        if self._runner is None:
+            self._set_rows(query())
+            return
+        self._runner.submit(query, self._set_rows, kind="items")
+
+    def _set_row_window(self):
+        offset, count = self._row_window
+        index = self._get_sorted_index()
+        # read ahead by one window in both scroll directions
+        start = max(0, min(offset, len(index) - count) - count)
+        self._show_items(index[start : start + 3 * count])
+        self.row_offset = start
+
+    def vue_request_row_window(self, data):
+        offset, count = data
+        self._view_scheduler.schedule({"row_window": (offset, max(1, count))})
+
+    def _apply_view_updates(self, updates):
+        # apply all pending updates, then show the resulting view once
+        if "row_window" in updates:
+            self._row_window = updates["row_window"]
+        if "column_offset" in updates:
+            self._set_column_window()
+        if "search" in updates:
+            # the filtered view is shown once the filters are evaluated
+            self._apply_filters()
+            return
+        self._show_view()
+
+    @traitlets.observe("search")
+    def _on_search_change(self, change):
+        if change["old"] == change["new"]:
+            return
+        self._view_scheduler.schedule({"search": change["new"]})
+
+    def _show_items(self, index):
+        if self._batch_columns is not None:
+            # the current view is shown once the batch ends
+            self._batch_show = True
             return
+        if self._runner is None:
+            self._push_items(index, self._prepare_items(index))
+            return
+        self._runner.submit(
+            lambda: self._prepare_items(index),
+            lambda payload: self._push_items(index, payload),
+            kind="items",
+        )
+
+    def _prepare_items(self, index):
+        if self.binary_transport:
+            return encode_columns(self.dataframe, index, self._item_columns)
+        dirty = set(self._dirty_index)
+        patch = compute_patch(self._item_index, index, dirty)
+        if patch is not None:
+            removed, inserted, updated = patch
+            if len(inserted) + len(updated) > len(index) // 2:
+                patch = None
+        if patch is None:
+            return dirty, None, self._get_items(index=index)
+        records = self._get_items(index=index[np.concatenate([inserted, updated])])
+        inserted = list(zip(inserted.tolist(), records[: len(inserted)]))
+        updated = list(zip(updated.tolist(), records[len(inserted) :]))
+        return dirty, (removed.tolist(), inserted, updated), None
+
+    def _push_items(self, index, payload):
+        self._item_index = index
+        if self.binary_transport:
+            self._send_binary_rows(*payload)
+            return
+        dirty, patch, items = payload
+        self._dirty_index -= dirty
+        if patch is None:
+            self._set_rows(items)
+            return
+        removed, inserted, updated = patch
+        if len(removed) + len(inserted) + len(updated) == 0:
+            return
+        # the synced items are never changed in place, or they would stop
+        # differing from the next items assigned
+        rows = list(self._rows)
+        apply_patch(rows, removed, inserted, updated)
+        self._rows = rows
+        self._item_positions = None
+        self._items_patched = True
+        self.send({"method": "patch_rows", "args": [removed, inserted, updated]})
+
+    def _set_rows(self, rows):
+        self._rows = rows
+        self._item_positions = None
+        if self._items_patched:
+            # the browser no longer shows the synced items, so assigning
+            # equal items would not replace its rows
+            self.send({"method": "set_rows", "args": [rows]})
+            return
+        self.items = rows
+
+    def _send_binary_rows(self, header, buffers):
+        self.send({"method": "set_rows_binary", "args": [header]}, buffers=buffers)
+
+    def _set_loading(self, loading):
+        self.loading = loading
+
+    def vue_request_rows(self, *args):
+        if self.binary_transport:
+            self._send_binary_rows(
+                *encode_columns(self.dataframe, self._item_index, self._item_columns)
+            )
+            return
+        # views created after a patch start from outdated items
+        if not self._items_patched:
+            return
+        self.send({"method": "set_rows", "args": [self._rows]})
+
+    @traitlets.observe("options")
+    def _on_options_change(self, change):
+        if change["old"] == change["new"]:
+            return
+        if self.virtual_scroll:
+            self._set_row_window()
+        elif self.server_side:
+            self._set_page()
+
+    def _get_item_positions(self):
+        if self._item_positions is None:
+            self._item_positions = {
+                item["index"]: position for position, item in enumerate(self._rows)
+            }
+        return self._item_positions
+
+    def _update_rows(self, index):
+        records = self._get_items(index=pd.Index(index))
+        positions = self._get_item_positions()
+        rows = list(self._rows)
+        for record in records:
+            position = positions.get(record["index"])
+            if position is not None:
+                # keep the kernel-side rows in sync without resending them
+                rows[position] = record
+        self._rows = rows
+        self._items_patched = True
+        self.send({"method": "update_rows", "args": [records]})
+
+    def _refresh_filters(self):
         selection = {
             column_name: (filter_type, value)
             for (
@@ -381,22 +532,203 @@ class _TableDisplay(HasValidDataframe, v.VuetifyTemplate):  # type: ignore
         assert isinstance(self.lazyfilter, _DataFrameFilter)
         with self.lazyfilter.block_callbacks():
             self.lazyfilter.update(selection, reset=True)
-        if not self.editing:
-            self.show_filter_snackbar = True
-            self.filter_snackbar_timeout = 5000
 
-    def vue_on_edit_close(self, args):
+    def vue_edit_cell(self, data):
+        index, column_name, value = data
         self.editing = False
+        dtype = self.schema[column_name].dtype
+        try:
+            value = self.schema[column_name].parse(value)
+        except ValueError:
+            self.input_error = "Unsupported value."
+            return
+        if self.dataframe.at[index, column_name] == value:
+            return
+        self._write_values(
+            column_name,
+            self.dataframe.index.get_indexer([index]),
+            pd.Series([value], dtype=dtype).to_numpy(),
+        )
 
-    def vue_on_edit_submit(self, args):
-        self.editing = False
-        self._set_items(index=self.current_index)
+    def bulk_update(self, column_name, values, index=None):
+        """Set the values of a column for many rows at once.
+
+        Parameters
+        ----------
+        column_name : str
+            The column to update.
+        values : scalar or array-like
+            A single value for all rows or one value per row, in the order
+            of the index.
+        index : pd.Index, optional
+            Index of the rows to update, defaults to the filtered rows.
+
+        Raises
+        ------
+        ValueError
+            If the index is empty, if the values do not fit the dtype of the
+            column, or if they are a series with a different index.
+        KeyError
+            If the index contains labels that are not in the dataframe.
+        """
+        if index is None:
+            index = self.current_index
+        index = pd.Index(index)
+        if len(index) == 0:
+            raise ValueError("No rows to update.")
+        positions = self.dataframe.index.get_indexer(index)
+        if (positions < 0).any():
+            raise KeyError(f"{list(index[positions < 0])} not in index")
+        if isinstance(values, pd.Series) and not values.index.equals(index):
+            # aligning the values would write missing values to other rows
+            raise ValueError("The index of the values does not match the index.")
+        if pd.api.types.is_list_like(values):
+            values = np.asarray(values)
+        column_schema = self.schema[column_name]
+        values = column_schema.cast(pd.Series(values, index=index))
+        if column_schema.kind == "categorical":
+            new_categories = values[
+                ~values.isin(column_schema.categories) & values.notna()
+            ].unique()
+            if len(new_categories) > 0:
+                self.dataframe[column_name] = self.dataframe[
+                    column_name
+                ].cat.add_categories(new_categories)
+                self.schema.invalidate(column_name)
+        self._write_values(column_name, positions, values.to_numpy())
+
+    def _write_values(self, column_name, positions, values, *, record=True):
+        column = self.dataframe.columns.get_loc(column_name)
+        old_values = self.dataframe.iloc[positions, column].to_numpy()
+        self.dataframe.iloc[positions, column] = values
+        for value in pd.unique(values):
+            self._text_index.add(column_name, value)
+        search_mask = self.lazyfilter.search_mask
+        if search_mask is not None and column_name in self._text_index.columns:
+            # edited rows may start or stop matching the search
+            search_mask = search_mask.copy()
+            search_mask[positions] = self._text_index.search_rows(
+                self._searched, positions
+            )
+            self.lazyfilter.search_mask = search_mask
+        if record:
+            self.edit_log.record(column_name, positions, old_values, values)
+        self.can_undo = self.edit_log.can_undo
+        self.can_redo = self.edit_log.can_redo
+        # also drops the sort order shared with the table
+        if len(positions) == 1:
+            self.lazyfilter.invalidate(column_name, replaced=(old_values[0], values[0]))
+        else:
+            self.lazyfilter.invalidate(column_name)
+        self._sorted_index = None
+        index = self.dataframe.index[positions]
+        if self._batch_columns is not None:
+            self._batch_columns.add(column_name)
+            self._mark_dirty(index)
+            self._batch_show = True
+            return
+        self._set_uniques(column_name)
+        if len(positions) == 1:
+            self._update_rows(index)
+        else:
+            # displayed rows are resent as a single patch
+            self._mark_dirty(index)
+            self._show_items(self._item_index)
+        self._refresh_filters()
         self.show_filter_snackbar = True
         self.filter_snackbar_timeout = 5000
 
+    def _mark_dirty(self, index):
+        # binary rows are always sent in full, only patched rows are tracked
+        if not self.binary_transport:
+            self._dirty_index.update(self._item_index.intersection(index))
+
+    @contextmanager
+    def batch(self):
+        """Defer recomputation and synchronization until the end of the block.
+
+        Filters are evaluated, statistics refreshed and rows sent at most
+        once when the outermost batch ends.
+        """
+        if self._batch_columns is not None:
+            yield
+            return
+        self._batch_columns = set()
+        self._batch_show = False
+        try:
+            with self.hold_sync(), self.lazyfilter.batch():
+                try:
+                    yield
+                finally:
+                    for column_name in self._batch_columns:
+                        self._set_uniques(column_name)
+                    if len(self._batch_columns) > 0:
+                        self._refresh_filters()
+                        self.show_filter_snackbar = True
+                        self.filter_snackbar_timeout = 5000
+        finally:
+            self._batch_columns = None
+            # filters evaluated in the background show the view once done
+            if self._batch_show and not (
+                self._runner is not None and self._runner.is_running("filter")
+            ):
+                self._set_items(index=self._view_index)
+
+    def undo(self):
+        edit = self.edit_log.undo()
+        if edit is not None:
+            self._write_values(
+                edit.column, edit.positions, edit.old_values, record=False
+            )
+
+    def redo(self):
+        edit = self.edit_log.redo()
+        if edit is not None:
+            self._write_values(
+                edit.column, edit.positions, edit.new_values, record=False
+            )
+
+    def commit(self):
+        self.edit_log.commit()
+        self.can_undo = self.can_redo = False
+
+    def discard(self):
+        for edit in self.edit_log.discard():
+            self._write_values(
+                edit.column, edit.positions, edit.old_values, record=False
+            )
+
+    def vue_undo(self, args):
+        self.undo()
+
+    def vue_redo(self, args):
+        self.redo()
+
+    def vue_edit_column(self, data):
+        column_name, value = data
+        self.editing = False
+        if len(self.current_index) == 0:
+            return
+        try:
+            value = self.schema[column_name].parse(value)
+            self.bulk_update(column_name, value)
+        except ValueError:
+            self.input_error = "Unsupported value."
+
+    def vue_on_edit_close(self, args):
+        self.editing = False
+
+    def _apply_filters(self):
+        # the search matches rows in any text column, in addition to the filters
+        self._searched = self.search
+        self.lazyfilter.search_mask = (
+            self._text_index.search(self.search) if self.search else None
+        )
+        self.lazyfilter.evaluate([lambda index: self._set_items(index=index)])
+
     def vue_apply_filters(self, args):
         self.show_filter_snackbar = False
-        self._set_items(index=self.lazyfilter.apply().index)
+        self._apply_filters()
 
     def vue_toggle_fullscreen(self, args):
         self._data_table.toggle_fullscreen()
@@ -405,22 +737,38 @@ class _TableDisplay(HasValidDataframe, v.VuetifyTemplate):  # type: ignore
 class InteractiveTable(v.Col):
     def __init__(
         self,
-        dataframe,
+        dataframe=None,
         *,
+        backend=None,
         filter_dependencies=None,
         show_index=True,
         show_actions=True,
         visible_columns=None,
         actions=None,
         action_dialogs=None,
-        editable=True,
-        filterable=True,
+        editable=None,
+        filterable=None,
         allow_fullscreen=True,
+        server_side=None,
+        binary_transport=False,
+        filter_delay=0.1,
+        background=False,
+        column_window=None,
+        virtual_scroll=False,
+        searchable=False,
     ):
         self.fullscreen = False
+        # tables of a backend are read-only and paged on the server by default
+        if editable is None:
+            editable = backend is None
+        if filterable is None:
+            filterable = backend is None
+        if server_side is None:
+            server_side = backend is not None
         self.display = _TableDisplay(
             self,
             dataframe,
+            backend=backend,
             filter_dependencies=filter_dependencies,
             show_index=show_index,
             show_actions=show_actions,
@@ -430,6 +778,13 @@ class InteractiveTable(v.Col):
             editable=editable,
             filterable=filterable,
             allow_fullscreen=allow_fullscreen,
+            server_side=server_side,
+            binary_transport=binary_transport,
+            filter_delay=filter_delay,
+            background=background,
+            column_window=column_window,
+            virtual_scroll=virtual_scroll,
+            searchable=searchable,
         )
         self.content = v.Card(
             children=[v.Sheet(class_="pa-4", children=[self.display])]
@@ -461,6 +816,31 @@ class InteractiveTable(v.Col):
     def toggle_fullscreen(self):
         self.set_fullscreen(not self.fullscreen)
 
+    def bulk_update(self, column_name, values, index=None):
+        self.display.bulk_update(column_name, values, index=index)
+
+    def batch(self):
+        """Context in which updates are applied and shown only once at the end."""
+        return self.display.batch()
+
+    def undo(self):
+        self.display.undo()
+
+    def redo(self):
+        self.display.redo()
+
+    def commit(self):
+        """Accept all edits, which cannot be undone afterwards."""
+        self.display.commit()
+
+    def discard(self):
+        """Revert all edits since the last commit."""
+        self.display.discard()
+
+    def get_changes(self):
+        """The net changes since the last commit as a dataframe."""
+        return self.display.edit_log.diff()
+
 
 class Table(InteractiveTable):
     def __init__(
@@ -478,4 +858,11 @@ class Table(InteractiveTable):
             editable=False,
             filterable=False,
             allow_fullscreen=False,
+            server_side=False,
+            binary_transport=False,
+            filter_delay=0.0,
+            background=False,
+            column_window=None,
+            virtual_scroll=False,
+            searchable=False,
         )
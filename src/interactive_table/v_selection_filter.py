@@ -23,15 +23,19 @@ class SelectionFilter(Autocomplete):
 
     @property
     def values(self):
-        return self.items
+        return self._values
 
     @values.setter
     def values(self, values):
         # if np.isdtype(np.asarray(values).dtype, "bool"):
         #     unique_values = np.asarray([True, False])
         # else:
-        unique_values = np.unique(values)
-        self.items = unique_values.tolist()
+        self.set_unique_values(np.unique(values).tolist())
+
+    def set_unique_values(self, values):
+        """Set values that are unique and sorted already."""
+        self._values = values
+        self.set_values(self._values)
 
     @property
     def value(self):
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from interactive_table import ArrowDatasetBackend, InteractiveTable, PandasBackend
+
+FILTERS = [("x", "value_range", (10, 20)), ("s", "selected_values", ("k1", "k2"))]
+
+
+def test_quantile_range_excludes_missing_values():
+    backend = PandasBackend(pd.DataFrame({"a": [4.0, np.nan, 1.0, 3.0, 2.0]}))
+    mask = backend.mask("a", "quantile_range", (0.0, 1.0))
+    np.testing.assert_array_equal(mask, [True, False, True, True, True])
+    mask = backend.mask("a", "quantile_range", (0.5, 1.0))
+    np.testing.assert_array_equal(mask, [True, False, False, True, False])
+
+
+def test_pandas_backend_pages():
+    dataframe = pd.DataFrame(
+        {"a": np.arange(10), "b": [3, 1, 2] * 3 + [np.nan], "c": list("xyzxyzxyzx")}
+    ).astype({"c": object})
+    backend = PandasBackend(dataframe)
+    filters = [("a", "value_range", (1, 9)), ("c", "selected_values", ["x", "y"])]
+    assert backend.count(filters) == 6
+    page = backend.page(
+        filters=filters, sort_by=["b", "a"], descending=[True, False], offset=1, limit=3
+    )
+    assert page.index.tolist() == [6, 1, 4]
+    page = backend.page(
+        filters=filters, sort_by=["b"], descending=[False], offset=4, columns=["c"]
+    )
+    assert page.index.tolist() == [6, 9]
+    assert page.columns.tolist() == ["c"]
+    assert backend.column_stats("b") == (1.0, 3.0)
+    assert backend.uniques("c") == ["x", "y", "z"]
+
+
+@pytest.fixture(params=["parquet", "ipc"])
+def arrow_backends(request, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    feather = pytest.importorskip("pyarrow.feather")
+    pq = pytest.importorskip("pyarrow.parquet")
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame(
+        {
+            "x": np.arange(1000) % 97,
+            "y": rng.random(1000),
+            "s": np.array([f"k{i % 13}" for i in range(1000)], dtype=object),
+        }
+    ).astype({"s": object})
+    table = pa.Table.from_pandas(dataframe, preserve_index=False)
+    if request.param == "parquet":
+        pq.write_table(table, tmp_path / "data.parquet", row_group_size=100)
+    else:
+        feather.write_feather(table, tmp_path / "data.arrow", chunksize=100)
+    arrow_backend = ArrowDatasetBackend(tmp_path, format=request.param, batch_size=64)
+    return arrow_backend, PandasBackend(dataframe)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"offset": 250, "limit": 5},
+        {"offset": 990, "limit": 50},
+        {"offset": 10},
+        {"filters": FILTERS, "offset": 3, "limit": 4},
+        {"filters": FILTERS},
+        {"filters": FILTERS, "sort_by": ["y"], "descending": [True], "limit": 3},
+        {"filters": FILTERS, "sort_by": ["x", "y"], "descending": [True], "offset": 2},
+        {"sort_by": ["y"], "offset": 900, "columns": ["y", "s"]},
+        {"filters": [("y", "quantile_range", (0.1, 0.9))], "limit": 20},
+    ],
+)
+def test_arrow_pages_match_pandas_pages(arrow_backends, query):
+    arrow_backend, pandas_backend = arrow_backends
+    arrow_page = arrow_backend.page(**query)
+    pandas_page = pandas_backend.page(**query)
+    offset = query.get("offset", 0)
+    assert arrow_page.index.tolist() == list(range(offset, offset + len(pandas_page)))
+    pd.testing.assert_frame_equal(
+        arrow_page.reset_index(drop=True), pandas_page.reset_index(drop=True)
+    )
+    filters = query.get("filters", ())
+    assert arrow_backend.count(filters) == pandas_backend.count(filters)
+
+
+def test_arrow_statistics(arrow_backends):
+    arrow_backend, pandas_backend = arrow_backends
+    assert arrow_backend.schema["s"].kind == "string"
+    assert arrow_backend.column_stats("x") == pandas_backend.column_stats("x")
+    assert arrow_backend.uniques("s") == pandas_backend.uniques("s")
+
+
+def test_arrow_quantiles_are_cached(arrow_backends):
+    arrow_backend, _ = arrow_backends
+    filters = [("y", "quantile_range", (0.25, 0.75))]
+    assert arrow_backend.count(filters) == arrow_backend.count(filters) == 500
+    assert list(arrow_backend._quantiles) == [("y", (0.25, 0.75))]
+
+
+def test_tables_of_arrow_backends_show_pages(arrow_backends):
+    arrow_backend, pandas_backend = arrow_backends
+    display = InteractiveTable(backend=arrow_backend).display
+    display.options = {"page": 3, "itemsPerPage": 5, "sortBy": ["y"], "sortDesc": []}
+    expected = pandas_backend.page(sort_by=["y"], offset=10, limit=5)
+    assert display.server_items_length == 1000
+    assert [row["index"] for row in display.items] == list(range(10, 15))
+    assert [row["y"] for row in display.items] == expected["y"].tolist()
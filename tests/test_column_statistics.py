@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from interactive_table.column_statistics import ColumnStatistics
+from interactive_table.sort_cache import SortCache
+
+
+def _statistics(dataframe):
+    return ColumnStatistics(dataframe, SortCache(dataframe))
+
+
+def test_statistics_ignore_missing_values():
+    dataframe = pd.DataFrame(
+        {
+            "a": [3.0, np.nan, 1.0, 3.0],
+            "c": pd.Categorical(["x", None, "x", "z"], categories=["x", "y", "z"]),
+        }
+    )
+    statistics = _statistics(dataframe)
+    assert statistics.unique_values("a") == [1.0, 3.0]
+    assert statistics.bounds("a") == (1.0, 3.0)
+    # unused categories are not unique values
+    assert statistics.unique_values("c") == ["x", "z"]
+
+
+def test_replace_matches_recomputed_statistics():
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame({"a": rng.integers(0, 10, 50)})
+    statistics = _statistics(dataframe)
+    for _ in range(100):
+        statistics.unique_values("a")
+        statistics.bounds("a")
+        position = rng.integers(50)
+        old, new = dataframe.loc[position, "a"], rng.integers(-5, 15)
+        dataframe.loc[position, "a"] = new
+        statistics.sort_cache.invalidate("a")
+        statistics.replace("a", old, new)
+        expected = _statistics(dataframe)
+        assert statistics.unique_values("a") == expected.unique_values("a")
+        assert statistics.bounds("a") == expected.bounds("a")
+
+
+def test_version_changes_with_the_column():
+    statistics = _statistics(pd.DataFrame({"a": [1], "b": [2]}))
+    version = statistics.version("a")
+    statistics.invalidate("b")
+    assert statistics.version("a") == version
+    statistics.replace("a", 1, 2)
+    assert statistics.version("a") != version
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from interactive_table import load_columnar, save_columnar
+
+
+def _is_memory_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+@pytest.fixture
+def dataframe():
+    index = pd.Index(["a", "b", "c", "d"], dtype=object, name="key")
+    return pd.DataFrame(
+        {
+            "i": np.arange(4, dtype="int32"),
+            "f": [0.5, np.nan, 1.5, 2.0],
+            "b": [True, False, True, False],
+            "s": pd.Series(["x", None, "y", "x"], dtype=object, index=index),
+            "c": pd.Categorical(["u", "v", "u", None], ordered=True),
+        },
+        index=index,
+    )
+
+
+def test_round_trip(tmp_path, dataframe):
+    save_columnar(dataframe, tmp_path)
+    loaded = load_columnar(tmp_path)
+    # compares the memory-mapped categorical codes as values
+    pd.testing.assert_frame_equal(
+        loaded.copy().astype({"c": object}), dataframe.astype({"c": object})
+    )
+    assert loaded["c"].dtype == dataframe["c"].dtype
+    assert _is_memory_mapped(loaded["f"].to_numpy())
+    assert _is_memory_mapped(loaded["c"].array.codes)
+
+
+def test_edits_are_not_written_back(tmp_path, dataframe):
+    save_columnar(dataframe, tmp_path)
+    loaded = load_columnar(tmp_path)
+    loaded.iloc[0, 0] = 10
+    assert load_columnar(tmp_path)["i"].iloc[0] == 0
+
+
+def test_strings_as_categorical(tmp_path, dataframe):
+    save_columnar(dataframe.reset_index(drop=True), tmp_path)
+    loaded = load_columnar(tmp_path, categorical_strings=True)
+    assert isinstance(loaded["s"].dtype, pd.CategoricalDtype)
+    assert loaded["s"].cat.categories.tolist() == ["x", "y"]
+    assert loaded["s"].cat.codes.tolist() == [0, -1, 1, 0]
+    assert isinstance(loaded.index, pd.RangeIndex)
+
+
+def test_string_dtype_round_trip(tmp_path):
+    dataframe = pd.DataFrame({"s": pd.Series(["x", None, "y"], dtype="str")})
+    save_columnar(dataframe, tmp_path)
+    pd.testing.assert_frame_equal(load_columnar(tmp_path), dataframe)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        pd.array([1, None, 3], dtype="Int64"),
+        pd.date_range("2024-01-01", periods=3, tz="UTC"),
+        pd.Series([(1, 2), None, (3,)], dtype=object),
+    ],
+)
+def test_unsupported_values_are_not_written(tmp_path, values):
+    dataframe = pd.DataFrame({"i": np.arange(3), "v": values})
+    with pytest.raises(ValueError):
+        save_columnar(dataframe, tmp_path / "cache")
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from interactive_table.edit_log import EditLog
+
+
+def test_undo_and_redo():
+    edit_log = EditLog(pd.DataFrame({"a": [1, 2, 3]}))
+    assert not edit_log.can_undo
+    edit_log.record("a", [0, 2], [1, 3], [5, 6])
+    edit = edit_log.undo()
+    assert edit.column == "a"
+    np.testing.assert_array_equal(edit.old_values, [1, 3])
+    assert edit_log.can_redo
+    assert edit_log.redo() is edit
+    edit_log.record("a", [1], [2], [7])
+    assert not edit_log.can_redo
+    assert [edit.new_values.tolist() for edit in edit_log.discard()] == [[7], [5, 6]]
+    assert not edit_log.can_undo
+
+
+def test_diff_contains_net_changes():
+    edit_log = EditLog(pd.DataFrame({"a": [1, 2], "b": ["x", None]}, index=[10, 20]))
+    edit_log.record("a", [0, 1], [1, 2], [5, 6])
+    edit_log.record("a", [1], [6], [2])
+    edit_log.record("b", [1], [None], ["y"])
+    edit_log.record("a", [0], [5], [8])
+    diff = edit_log.diff()
+    assert diff.to_dict(orient="records") == [
+        {"index": 10, "column": "a", "old": 1, "new": 8},
+        {"index": 20, "column": "b", "old": None, "new": "y"},
+    ]
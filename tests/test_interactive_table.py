@@ -0,0 +1,317 @@
+import asyncio
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from interactive_table import InteractiveTable, PandasBackend
+from interactive_table.patches import apply_patch
+
+
+class Browser:
+    """The rows a browser shows, given the synced items and the messages."""
+
+    def __init__(self, display):
+        self.synced_items = copy.deepcopy(display.items)
+        self.rows = copy.deepcopy(display.items)
+        display.observe(self._on_items_change, names="items")
+        display.send = self._receive
+
+    def _on_items_change(self, change):
+        # like Backbone, only values that differ from the synced value change
+        if change["new"] != self.synced_items:
+            self.synced_items = copy.deepcopy(change["new"])
+            self.rows = copy.deepcopy(change["new"])
+
+    def _receive(self, message, buffers=None):
+        if message["method"] == "set_rows":
+            (self.rows,) = copy.deepcopy(message["args"])
+        elif message["method"] == "patch_rows":
+            apply_patch(self.rows, *copy.deepcopy(message["args"]))
+        elif message["method"] == "update_rows":
+            positions = {
+                row["index"]: position for position, row in enumerate(self.rows)
+            }
+            for record in message["args"][0]:
+                self.rows[positions[record["index"]]] = record
+
+
+@pytest.fixture
+def dataframe():
+    return pd.DataFrame({"a": np.arange(20), "b": np.linspace(0, 1, 20)})
+
+
+def test_clearing_a_narrowed_filter_shows_all_rows(dataframe):
+    display = InteractiveTable(dataframe).display
+    browser = Browser(display)
+    all_rows = copy.deepcopy(display.items)
+
+    # removed rows are sent as patches
+    display.lazyfilter.update({"a": ("value_range", (0, 17))})
+    display.lazyfilter.update({"a": ("value_range", (0, 2))})
+    assert [row["index"] for row in browser.rows] == [0, 1, 2]
+
+    # many inserted rows replace all items, which equal the synced ones
+    display.lazyfilter.update({"a": ("value_range", (0, 19))})
+    assert browser.rows == all_rows
+
+
+def test_edited_rows_are_shown_after_a_full_update(dataframe):
+    display = InteractiveTable(dataframe).display
+    browser = Browser(display)
+
+    display.vue_edit_cell([3, "b", "0.5"])
+    assert browser.rows[3]["b"] == 0.5
+
+    display.lazyfilter.update({"a": ("value_range", (0, 5))})
+    display.lazyfilter.update({"a": ("value_range", (0, 19))})
+    assert browser.rows == display._get_items()
+
+
+def test_edit_column_with_unsupported_value_shows_error():
+    dataframe = pd.DataFrame({"a": np.arange(4, dtype="int32")})
+    display = InteractiveTable(dataframe).display
+    display.vue_edit_column(["a", "5"])
+    assert (dataframe["a"] == 5).all()
+    assert dataframe["a"].dtype == "int32"
+    display.vue_edit_column(["a", "x"])
+    assert display.input_error == "Unsupported value."
+
+
+def test_bulk_update_rejects_values_with_other_index(dataframe):
+    table = InteractiveTable(dataframe)
+    with pytest.raises(ValueError):
+        table.bulk_update("b", pd.Series([1.0, 2.0], index=[5, 6]), index=[0, 1])
+    assert not dataframe["b"].isna().any()
+    table.bulk_update("b", pd.Series([1.0, 2.0], index=[0, 1]), index=[0, 1])
+    assert dataframe["b"].iloc[:2].tolist() == [1.0, 2.0]
+
+
+def test_bulk_update_rejects_unknown_or_missing_rows(dataframe):
+    table = InteractiveTable(dataframe)
+    expected = dataframe.copy()
+    with pytest.raises(KeyError):
+        table.bulk_update("b", 9.0, index=[0, 100])
+    with pytest.raises(ValueError):
+        table.bulk_update("b", 9.0, index=[])
+    pd.testing.assert_frame_equal(dataframe, expected)
+    assert not table.display.edit_log.can_undo
+
+
+def _schedule_together(display, *changes):
+    # collect the view updates of several changes, as the scheduler does
+    # for changes within its delay
+    pending = {}
+    display._view_scheduler.callback = pending.update
+    for change in changes:
+        change()
+    display._view_scheduler.callback = display._apply_view_updates
+    display._apply_view_updates(pending)
+
+
+def test_combined_view_updates_are_all_applied(dataframe):
+    dataframe["c"] = dataframe["a"].astype(str).astype(object)
+    display = InteractiveTable(
+        dataframe, virtual_scroll=True, column_window=1, searchable=True
+    ).display
+    browser = Browser(display)
+
+    _schedule_together(
+        display,
+        lambda: display.vue_request_row_window([10, 2]),
+        lambda: setattr(display, "column_offset", 1),
+    )
+    assert [row["index"] for row in browser.rows] == [8, 9, 10, 11, 12, 13]
+    assert "b" in browser.rows[0]
+
+    _schedule_together(
+        display,
+        lambda: setattr(display, "search", "1"),
+        lambda: display.vue_request_row_window([0, 2]),
+    )
+    assert display.server_items_length == 11
+    assert [row["index"] for row in browser.rows] == [1, 10, 11, 12, 13, 14]
+
+
+def test_search_mask_follows_edits(dataframe):
+    dataframe["c"] = pd.Series(["x"] * 10 + ["y"] * 10, dtype=object)
+    display = InteractiveTable(dataframe, searchable=True).display
+    display.search = "x"
+    assert len(display.current_index) == 10
+
+    display.vue_edit_cell([0, "c", "y"])
+    display.vue_edit_cell([15, "c", "x"])
+    display.lazyfilter.update({"a": ("value_range", (0, 19))})
+    assert sorted(display.current_index) == [*range(1, 10), 15]
+
+
+def test_batch_in_background_shows_rows_once(dataframe):
+    shown = []
+
+    async def main():
+        table = InteractiveTable(dataframe, background=True)
+        display = table.display
+        while display.loading:
+            await asyncio.sleep(0.01)
+        show_items = display._show_items
+        display._show_items = lambda index: (
+            shown.append(list(index)),
+            show_items(index),
+        )
+        with table.batch():
+            table.bulk_update("b", 1.0, index=[0, 1])
+            display.lazyfilter.update({"a": ("value_range", (0, 9))})
+        while display.loading:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert shown == [list(range(10))]
+    assert (dataframe["b"].iloc[:2] == 1.0).all()
+
+
+def test_selection_widgets_use_unique_values_of_statistics(monkeypatch, dataframe):
+    dataframe["c"] = pd.Series(["y", "x"] * 10, dtype=object)
+    lazyfilter = InteractiveTable(dataframe).display.lazyfilter
+
+    np_unique = np.unique
+
+    def unique(values):
+        assert len(values) == 0, "the values are unique already"
+        return np_unique(values)
+
+    monkeypatch.setattr(np, "unique", unique)
+    assert lazyfilter.filter_widget(lazyfilter.get("c")).values == ["x", "y"]
+
+
+def test_server_side_pages(dataframe):
+    display = InteractiveTable(dataframe, server_side=True).display
+    browser = Browser(display)
+    assert display.server_items_length == 20
+    display.options = {**display.options, "page": 2, "itemsPerPage": 5}
+    assert [row["index"] for row in browser.rows] == [5, 6, 7, 8, 9]
+
+
+def test_server_side_page_is_clamped_when_the_view_shrinks(dataframe):
+    display = InteractiveTable(dataframe, server_side=True).display
+    browser = Browser(display)
+    display.options = {**display.options, "page": 4, "itemsPerPage": 5}
+    display.lazyfilter.update({"a": ("value_range", (0, 7))})
+    assert display.server_items_length == 8
+    assert display.options["page"] == 2
+    assert [row["index"] for row in browser.rows] == [5, 6, 7]
+
+
+def test_server_side_sorting(dataframe):
+    display = InteractiveTable(dataframe, server_side=True).display
+    browser = Browser(display)
+    display.options = {
+        **display.options,
+        "itemsPerPage": 3,
+        "sortBy": ["b"],
+        "sortDesc": [True],
+    }
+    assert [row["index"] for row in browser.rows] == [19, 18, 17]
+    display.options = {**display.options, "page": 2}
+    assert [row["index"] for row in browser.rows] == [16, 15, 14]
+
+
+def test_binary_transport_resends_edited_rows(dataframe):
+    table = InteractiveTable(dataframe, binary_transport=True)
+    sent = []
+    table.display.send = lambda message, buffers=None: sent.append(buffers)
+    table.bulk_update("b", 2.0, index=[1, 2, 3])
+    with table.batch():
+        table.bulk_update("b", 3.0, index=[4, 5])
+    assert table.display._dirty_index == set()
+    values = np.frombuffer(sent[-1][2], "<f8")
+    assert values[1:6].tolist() == [2.0, 2.0, 2.0, 3.0, 3.0]
+
+
+def test_changing_a_filter_reuses_the_masks_of_the_others(monkeypatch, dataframe):
+    lazyfilter = InteractiveTable(dataframe).display.lazyfilter
+    calls = []
+    mask = lazyfilter.backend.mask
+    monkeypatch.setattr(
+        lazyfilter.backend,
+        "mask",
+        lambda column, *args: calls.append(column) or mask(column, *args),
+    )
+    lazyfilter.update({"a": ("value_range", (2, 15)), "b": ("value_range", (0, 0.5))})
+    assert sorted(calls) == ["a", "b"]
+    calls.clear()
+    lazyfilter.update({"a": ("value_range", (4, 15))})
+    assert calls == ["a"]
+    assert lazyfilter.filtered_index().tolist() == list(range(4, 10))
+
+
+def test_selection_without_value_does_not_filter(dataframe):
+    dataframe["c"] = pd.Categorical(["x", "y"] * 10)
+    lazyfilter = InteractiveTable(dataframe).display.lazyfilter
+    lazyfilter.update({"c": ("selected_values", None)})
+    assert len(lazyfilter.filtered_index()) == 20
+
+
+def test_filter_widgets_are_built_when_their_menu_opens(dataframe):
+    lazyfilter = InteractiveTable(dataframe).display.lazyfilter
+    filter = lazyfilter.get("b")
+    assert filter not in lazyfilter._filter_widgets
+    assert "b" not in lazyfilter.statistics._bounds
+
+    lazyfilter.widget(filter).content.menu = True
+    assert filter in lazyfilter._filter_widgets
+    assert lazyfilter.statistics._bounds["b"] == (0.0, 1.0)
+
+
+def test_editor_searches_capped_uniques(monkeypatch):
+    monkeypatch.setattr(
+        "interactive_table.v_interactive_table._TableDisplay.max_uniques", 2
+    )
+    dataframe = pd.DataFrame({"s": pd.Series(["b", "a", "c", "ab"], dtype=object)})
+    display = InteractiveTable(dataframe, editable=True).display
+    assert display.searchable_uniques == ["s"]
+    assert len(display.uniques["s"]) == 2
+    display.vue_search_uniques(["s", "A"])
+    assert display.uniques["s"] == ["a", "ab"]
+
+
+def test_filter_uses_the_backend_of_the_table(monkeypatch, dataframe):
+    created = []
+    init = PandasBackend.__init__
+    monkeypatch.setattr(
+        PandasBackend,
+        "__init__",
+        lambda self, dataframe: created.append(self) or init(self, dataframe),
+    )
+    display = InteractiveTable(dataframe).display
+    display.lazyfilter.update({"a": ("value_range", (0, 2))})
+    assert created == [display.backend]
+    assert display.lazyfilter.backend is display.backend
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_tables_of_a_backend_request_pages(dataframe, background):
+    async def run():
+        display = InteractiveTable(
+            backend=PandasBackend(dataframe), background=background
+        ).display
+        display.options = {
+            "page": 2,
+            "itemsPerPage": 3,
+            "sortBy": ["b"],
+            "sortDesc": [True],
+        }
+        while display.loading:
+            await asyncio.sleep(0.01)
+        assert display.server_items_length == 20
+        assert [row["index"] for row in display.items] == [16, 15, 14]
+        assert not display.editable and not display.filterable
+
+    asyncio.run(run())
+
+
+def test_tables_of_a_backend_are_read_only(dataframe):
+    with pytest.raises(ValueError):
+        InteractiveTable(backend=PandasBackend(dataframe), editable=True)
+    with pytest.raises(ValueError):
+        InteractiveTable(dataframe, backend=PandasBackend(dataframe))
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from interactive_table.patches import apply_patch, compute_patch
+
+
+def _round_trip(old_index, new_index, dirty):
+    items = [("old", label) for label in old_index]
+    patch = compute_patch(old_index, new_index, dirty)
+    assert patch is not None
+    removed, inserted, updated = patch
+    apply_patch(
+        items,
+        removed.tolist(),
+        [(position, ("new", new_index[position])) for position in inserted],
+        [(position, ("new", new_index[position])) for position in updated],
+    )
+    return items
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_patch_round_trip(seed):
+    rng = np.random.default_rng(seed)
+    labels = rng.permutation(50)
+    old_index = pd.Index(labels[rng.random(50) < 0.5])
+    new_index = pd.Index(labels[rng.random(50) < 0.5])
+    dirty = set(rng.choice(labels, 5).tolist())
+    items = _round_trip(old_index, new_index, dirty)
+    assert [label for _, label in items] == new_index.tolist()
+    for kind, label in items:
+        if label in dirty or label not in old_index:
+            assert kind == "new"
+        else:
+            assert kind == "old"
+
+
+def test_patch_without_changes_is_empty():
+    index = pd.Index([3, 1, 2])
+    removed, inserted, updated = compute_patch(index, index)
+    assert len(removed) + len(inserted) + len(updated) == 0
+
+
+def test_reordered_rows_cannot_be_patched():
+    assert compute_patch(pd.Index([1, 2, 3]), pd.Index([3, 1, 2])) is None
@@ -0,0 +1,27 @@
+from interactive_table.prefix_index import PrefixIndex, SearchableValues
+
+
+def test_search_returns_sorted_matches_up_to_limit():
+    prefix_index = PrefixIndex(["beta", "Alpha", "alphabet", 3, "al", "gamma"])
+    assert len(prefix_index) == 6
+    assert prefix_index.search("AL", 10) == ["al", "Alpha", "alphabet"]
+    assert prefix_index.search("al", 2) == ["al", "Alpha"]
+    assert prefix_index.search("3", 10) == [3]
+    assert prefix_index.search("delta", 10) == []
+    assert prefix_index.search(None, 1) == [3]
+
+
+def test_keys_are_not_padded_to_the_longest_value():
+    prefix_index = PrefixIndex(["a" * 100_000] + [str(i) for i in range(1000)])
+    assert prefix_index._keys.nbytes < 100_000
+    assert prefix_index.search("aa", 10) == ["a" * 100_000]
+
+
+def test_searchable_values_index_on_first_search():
+    values = SearchableValues(["beta", "alpha", "gamma"], 2)
+    assert values.is_capped
+    assert values.search(None) == ["beta", "alpha"]
+    assert values._index is None
+    assert values.search("g") == ["gamma"]
+    assert values._index is not None
+    assert not SearchableValues(["beta", "alpha"], 2).is_capped
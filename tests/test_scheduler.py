@@ -0,0 +1,51 @@
+import asyncio
+import threading
+
+from interactive_table.scheduler import BackgroundRunner, UpdateScheduler
+
+
+def test_update_scheduler_merges_updates():
+    calls = []
+    scheduler = UpdateScheduler(calls.append, delay=0.05)
+
+    async def main():
+        for value in range(5):
+            scheduler.schedule({"a": value})
+            scheduler.schedule({"b": -value})
+        await asyncio.sleep(0.1)
+
+    asyncio.run(main())
+    assert calls == [{"a": 4, "b": -4}]
+
+
+def test_background_runner_delivers_newest_result_per_kind():
+    results = []
+    busy = []
+    runner = BackgroundRunner(on_busy=busy.append)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_filter():
+        started.set()
+        release.wait()
+        return "filter"
+
+    async def main():
+        runner.submit(slow_filter, results.append, kind="filter")
+        await asyncio.to_thread(started.wait)
+        # work of another kind does not discard the running filter
+        runner.submit(lambda: "old rows", results.append, kind="items")
+        runner.submit(lambda: "new rows", results.append, kind="items")
+        release.set()
+        while busy[-1]:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert sorted(results) == ["filter", "new rows"]
+    assert busy[-1] is False
+
+
+def test_background_runner_runs_synchronously_without_loop():
+    results = []
+    BackgroundRunner().submit(lambda: 1, results.append, kind="filter")
+    assert results == [1]
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from interactive_table.schema import ColumnSchema, TableSchema
+
+
+@pytest.mark.parametrize(
+    ("dtype", "text", "expected"),
+    [
+        ("int32", "7", 7),
+        ("uint8", "255", 255),
+        ("float32", "1.5", 1.5),
+        ("bool", "True", True),
+        ("O", "text", "text"),
+    ],
+)
+def test_parse_converts_to_the_column_dtype(dtype, text, expected):
+    value = ColumnSchema("a", np.dtype(dtype)).parse(text)
+    assert value == expected
+    assert type(value) is type(pd.Series([expected], dtype=dtype).iloc[0])
+
+
+@pytest.mark.parametrize(
+    ("dtype", "text"), [("int32", "1.5"), ("uint8", "256"), ("float32", "a")]
+)
+def test_parse_rejects_values_that_do_not_fit(dtype, text):
+    with pytest.raises(ValueError):
+        ColumnSchema("a", np.dtype(dtype)).parse(text)
+
+
+def test_parse_only_accepts_existing_categories():
+    schema = ColumnSchema("a", pd.CategoricalDtype([1, 2]))
+    assert schema.parse("2") == 2
+    with pytest.raises(ValueError):
+        schema.parse("3")
+
+
+def test_table_schema_ignores_unused_columns():
+    dataframe = pd.DataFrame({"a": [1], "t": pd.to_datetime(["2020-01-01"])})
+    schema = TableSchema(dataframe)
+    assert schema["a"].kind == "int"
+    assert "t" in schema
+    with pytest.raises(ValueError):
+        schema["t"]
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from interactive_table.sort_cache import SortCache
+
+
+def test_results_of_invalidated_columns_are_not_cached():
+    dataframe = pd.DataFrame({"a": [3, 1, 2]})
+    sort_cache = SortCache(dataframe)
+    read_values = sort_cache._values
+
+    def edit_while_reading(column):
+        values = read_values(column)
+        # e.g., a cell edited on the event loop while a worker thread sorts
+        dataframe.loc[0, "a"] = 0
+        sort_cache.invalidate(column)
+        return values
+
+    sort_cache._values = edit_while_reading
+    sort_cache.order("a")
+    sort_cache._values = read_values
+    np.testing.assert_array_equal(sort_cache.order("a"), [0, 1, 2])
+
+
+def test_quantiles_ignore_missing_values():
+    values = np.array([4.0, np.nan, 1.0, 3.0, np.nan, 2.0])
+    sort_cache = SortCache(pd.DataFrame({"a": values}))
+    q = [0.0, 0.3, 1.0]
+    np.testing.assert_allclose(sort_cache.quantiles("a", q), np.nanquantile(values, q))
+    positions = sort_cache.range_positions("a", *sort_cache.quantiles("a", [0, 1]))
+    assert sorted(positions.tolist()) == [0, 2, 3, 5]
+
+
+def test_quantiles_of_missing_values_are_missing():
+    sort_cache = SortCache(pd.DataFrame({"a": [np.nan, np.nan]}))
+    assert np.isnan(sort_cache.quantiles("a", [0.5])).all()
+
+
+@pytest.fixture
+def dataframe():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 5, 40).astype(float)
+    values[rng.random(40) < 0.3] = np.nan
+    return pd.DataFrame(
+        {
+            "a": values,
+            "b": rng.integers(0, 3, 40),
+            "c": pd.Categorical(rng.choice(["x", "y", None], 40)),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    ("columns", "descending"),
+    [
+        (["a"], [False]),
+        (["a"], [True]),
+        (["c"], [True]),
+        (["b", "a"], [False, True]),
+        (["a", "c"], [True, True]),
+        (["c", "b"], [True, False]),
+    ],
+)
+def test_sort_places_missing_values_last(dataframe, columns, descending):
+    sort_cache = SortCache(dataframe)
+    positions = np.arange(0, 40, 3)
+    expected = (
+        dataframe.iloc[positions]
+        .sort_values(
+            columns,
+            ascending=[not desc for desc in descending],
+            kind="stable",
+            na_position="last",
+        )
+        .index
+    )
+    np.testing.assert_array_equal(
+        sort_cache.sort(positions, columns, descending), expected
+    )
+    np.testing.assert_array_equal(
+        sort_cache.sort(np.arange(40), columns, descending),
+        dataframe.sort_values(
+            columns,
+            ascending=[not desc for desc in descending],
+            kind="stable",
+            na_position="last",
+        ).index,
+    )
+
+
+def test_sort_mixed_types_places_missing_values_last():
+    dataframe = pd.DataFrame({"a": pd.Series([2, None, "b", 1, "a"], dtype=object)})
+    sort_cache = SortCache(dataframe)
+    np.testing.assert_array_equal(sort_cache.order("a"), [3, 0, 4, 2, 1])
+    np.testing.assert_array_equal(
+        sort_cache.order("a", descending=True), [2, 4, 0, 3, 1]
+    )
+
+
+def test_sort_by_index():
+    dataframe = pd.DataFrame({"a": [1, 2, 3]}, index=[2, 0, 1])
+    sort_cache = SortCache(dataframe)
+    np.testing.assert_array_equal(
+        sort_cache.sort([0, 1, 2], [pd.Index], [True]), [0, 2, 1]
+    )
+
+
+def test_range_positions_and_encoding(dataframe):
+    sort_cache = SortCache(dataframe)
+    positions = sort_cache.range_positions("a", 1, 3)
+    expected = np.flatnonzero(dataframe["a"].between(1, 3))
+    np.testing.assert_array_equal(np.sort(positions), expected)
+    codes, uniques = sort_cache.encoding("c")
+    np.testing.assert_array_equal(
+        np.where(codes < 0, None, np.asarray(uniques)[codes]),
+        dataframe["c"].astype(object).where(dataframe["c"].notna(), None),
+    )
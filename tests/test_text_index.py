@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from interactive_table.sort_cache import SortCache
+from interactive_table.text_index import TextIndex
+
+
+def _text_index():
+    dataframe = pd.DataFrame(
+        {
+            "name": pd.Series(["Apple", "banana", None, "Cherry"], dtype=object),
+            "kind": pd.Categorical(["fruit", "fruit", "nut", "berry"]),
+        }
+    )
+    return dataframe, TextIndex(SortCache(dataframe), ["name", "kind"])
+
+
+def test_search_is_case_insensitive_over_all_columns():
+    _, text_index = _text_index()
+    np.testing.assert_array_equal(text_index.search("AN"), [False, True, False, False])
+    np.testing.assert_array_equal(text_index.search("rr"), [False, False, False, True])
+    np.testing.assert_array_equal(text_index.search("u"), [True, True, True, False])
+
+
+def test_search_rows_compares_current_values():
+    dataframe, text_index = _text_index()
+    text_index.search("apple")
+    dataframe.loc[1, "name"] = "Pineapple"
+    text_index.add("name", "Pineapple")
+    np.testing.assert_array_equal(
+        text_index.search_rows("apple", np.array([1, 3])), [True, False]
+    )
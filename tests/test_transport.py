@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from interactive_table.transport import encode_columns
+
+
+def test_encode_columns():
+    dataframe = pd.DataFrame(
+        {
+            "i": np.array([1, 2, 3], dtype="int32"),
+            "f": [0.5, np.nan, 1.5],
+            "b": [True, False, True],
+            "s": np.array(["x", None, "y"], dtype=object),
+            "c": pd.Categorical(["u", "v", "u"]),
+        },
+        index=[7, 8, 9],
+    )
+    header, buffers = encode_columns(dataframe, pd.Index([9, 7]))
+    columns = {column["name"]: column for column in header["columns"]}
+    buffers = dict(zip(columns, buffers))
+    assert header["num_rows"] == 2
+    assert list(columns) == ["index", "i", "f", "b", "s", "c"]
+    assert np.frombuffer(buffers["index"], "<i8").tolist() == [9, 7]
+    assert np.frombuffer(buffers["i"], "<i8").tolist() == [3, 1]
+    assert np.frombuffer(buffers["f"], "<f8").tolist() == [1.5, 0.5]
+    bits = np.unpackbits(np.frombuffer(buffers["b"], np.uint8), bitorder="little")
+    assert bits[:2].tolist() == [1, 1]
+    codes = np.frombuffer(buffers["s"], "<i4")
+    assert [columns["s"]["dictionary"][code] for code in codes] == ["y", "x"]
+    codes = np.frombuffer(buffers["c"], "<i4")
+    assert [columns["c"]["dictionary"][code] for code in codes] == ["u", "u"]
+
+
+def test_missing_values_have_code_minus_one():
+    dataframe = pd.DataFrame({"s": pd.Series([None, "x"], dtype=object)})
+    _, buffers = encode_columns(dataframe, dataframe.index, ["s"])
+    assert np.frombuffer(buffers[1], "<i4").tolist() == [-1, 0]